@@ -0,0 +1,41 @@
+# Characters used in aliases, the same unambiguous set as shortuuid
+ALPHABET = '23456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+ALIAS_LENGTH = 4
+
+class IdAllocator():
+    """
+    Hands out increasing integer IDs to foragers, hunters, food and
+    ravines. Each simulation owns one and numbers objects as it places
+    them, so the same seed always gives the same IDs. It is saved with
+    the simulation's checkpoints.
+    """
+    def __init__(self, next_id: int = 1) -> None:
+        self.next_id = next_id
+
+    def allocate(self) -> int:
+        """
+        The next unused ID.
+        """
+        entity_id = self.next_id
+        self.next_id = entity_id + 1
+        return entity_id
+
+    def reserve(self, entity_id: int) -> None:
+        """
+        Ensures an ID given out elsewhere, e.g. to an object placed in
+        another simulation, is never given out again.
+        """
+        if entity_id >= self.next_id:
+            self.next_id = entity_id + 1
+
+def id_alias(entity_id: int) -> str:
+    """
+    A short string for an ID, used in logs, e.g. 17 -> '222K'. Each ID has
+    a different alias.
+    """
+    base = len(ALPHABET)
+    characters = []
+    while entity_id:
+        entity_id, digit = divmod(entity_id, base)
+        characters.append(ALPHABET[digit])
+    return ''.join(reversed(characters)).rjust(ALIAS_LENGTH, ALPHABET[0])
@@ -1,36 +1,58 @@
 import random
-import shortuuid
+from dataclasses import dataclass
+
+from .entity_ids import id_alias
+
+@dataclass(frozen=True, slots=True)
+class FoodType():
+    """
+    A kind of food. Shared by every food of that kind.
+    """
+    name: str
+    sustenance_granted: float
+
+FOOD_TYPES = (
+    FoodType('pumpkin', 0.8),
+    FoodType('melon', 0.8),
+    FoodType('carrot', 0.4),
+    FoodType('apple', 0.3),
+    FoodType('mushroom', 0.3),
+    FoodType('shrub', 0.2),
+    FoodType('flower', 0.1),
+)
 
 class Food():
     """
     Food for the foragers to find and eat.
     """
+    __slots__ = ('id', 'food_type')
+
     def __init__(self) -> None:
-        self.id = self.__generate_id()
-        self.name, self.sustenance_granted = self.create_food()
-    
-    def create_food(self) -> tuple[str, float]:
+        # Given by the simulation when placed
+        self.id = None
+        self.food_type = self.create_food()
+
+    @property
+    def alias(self) -> str:
         """
-        Gets a food name and amount of sustenance granted.
+        Short string for the ID, used in logs. None until placed.
         """
-        food_dict = {
-            'pumpkin': 0.8,
-            'melon': 0.8,
-            'carrot': 0.4,
-            'apple': 0.3,
-            'mushroom': 0.3,
-            'shrub': 0.2,
-            'flower': 0.1,
-        }
-        name, sus = random.choice(list(food_dict.items()))
-        return name, sus
-    
-    def __generate_id(self) -> str:
+        return None if self.id is None else id_alias(self.id)
+
+    @property
+    def name(self) -> str:
+        return self.food_type.name
+
+    @property
+    def sustenance_granted(self) -> float:
+        return self.food_type.sustenance_granted
+
+    def create_food(self) -> FoodType:
         """
-        A unique ID for the food.
+        Picks a kind of food at random.
         """
-        return shortuuid.random(length=4)
-        
+        return random.choice(FOOD_TYPES)
+
     def __str__(self) -> str:
         """
         Overload str method for more informative output when printing.
@@ -1,11 +1,18 @@
 import math
 import random
-import tomllib
+from collections import deque
 
 from .mammal import Mammal
+from .forager_config import ForagerConfig, default_config
+from .population import PopulationStore, PopulationColumn
 from .food import Food
 from .hunter import Hunter
 from .ravine import Ravine
+from .visited_cells import VisitedCells
+from .motivation_metrics import MotivationMetrics, MotivationCount, Encounter
+from ..environment.target_queries import nearest_and_furthest
+from ..environment import event_log
+from ..environment.event_log import EventLog, render_event
 
 # * class ForagerActions is appended to the bottom of this file
 # * This is to avoid a circular import error.
@@ -15,7 +22,40 @@ class Forager(Mammal):
     """
     Agents who navigate the environment to eat, mate, adapt and evolve.
     """
-    def __init__(self, sex: str = None, parents_genes: dict = None) -> None:
+    __slots__ = ('population', 'population_row', 'detached_values', 'events',
+                 'record_actions', 'record_genes', 'sex', 'config',
+                 'compat_diff', 'decay_factor', 'hunger_combin', 'positive_multiplier',
+                 'use_novelty_search', 'compatability_threshold', 'evolved_abilities',
+                 'motivation_weights', 'destination_coordinates', 'current_motivation',
+                 'num_motivation_steps', 'successful_motivations', 'mated_with',
+                 'incompatible_with', 'visited', 'log', 'chosen_motivations',
+                 'num_decisions', 'num_novel_decisions', 'simulation_step',
+                 'motivation_metrics')
+    # Genes and state are held in the simulations population store
+    agility = PopulationColumn()
+    perception = PopulationColumn()
+    strength = PopulationColumn()
+    endurance = PopulationColumn()
+    hunger = PopulationColumn()
+    bravery = PopulationColumn()
+    steps_alive = PopulationColumn()
+    alive = PopulationColumn()
+    current_coords = PopulationColumn()
+    
+    def __init__(self, 
+                 sex: str = None, 
+                 parents_genes: dict = None, 
+                 config: ForagerConfig = None) -> None:
+        # Row in the population store, set when placed in a simulation
+        self.population = None
+        self.population_row = None
+        self.detached_values = {}
+        # Simulation event log, set when placed in a simulation
+        self.events: EventLog = None
+        # Whether actions and genes are logged this turn, set by the 
+        # simulations log level and sampling
+        self.record_actions = True
+        self.record_genes = True
         if parents_genes is not None:
             # Derives genes from parents
             agility = parents_genes['agility']
@@ -39,15 +79,15 @@ class Forager(Mammal):
         if self.sex != 'M' and self.sex != 'F':
             raise ValueError('Sex must be \'M\' or \'F\'')
         
-        with open('assets/agents/forager_config.toml', 'rb') as f:
-            self.config = tomllib.load(f)
-            self.hunger = self.__validate(self.config['hunger'], 'hunger')
-            self.bravery = self.__validate(self.config['bravery'], 'bravery')
-            self.compat_diff = self.__validate(self.config['compat_diff'], 'compat_diff', 1)
-            self.decay_factor = self.__validate(self.config['decay_factor'], 'decay_factor', 1)
-            self.hunger_combin = self.__validate(self.config['hunger_combinator'], 'hunger_combinator', 1)
-            self.positive_multiplier = self.__validate(self.config['positive_multiplier'], 'positive_multiplier', 1)
-            self.use_novelty_search = self.__validate(self.config['novelty_search'], 'novelty_search')
+        # Shared configuration, validated when it was loaded
+        self.config = config if config is not None else default_config()
+        self.hunger = self.config.hunger
+        self.bravery = self.config.bravery
+        self.compat_diff = self.config.compat_diff
+        self.decay_factor = self.config.decay_factor
+        self.hunger_combin = self.config.hunger_combinator
+        self.positive_multiplier = self.config.positive_multiplier
+        self.use_novelty_search = self.config.novelty_search
         
         self.compatability_threshold = self.__get_compatibility()
         
@@ -70,12 +110,12 @@ class Forager(Mammal):
         # * Attributes emulating persistent memory
         self.current_motivation = None 
         self.num_motivation_steps = 0 
-        self.successful_motivations = []
-        self.mated_with = [] # Foragers mated with
-        self.incompatible_with = [] # Foragers unable to mate with
-        self.explored_coords = [] # Explored coordinates
-        self.log = [] # Log of actions
-        self.gene_log = [] # Log of gene updates
+        # Lists keep only their most recent entries, up to the configured limits
+        self.successful_motivations = deque(maxlen=self.config.memory_limit)
+        self.mated_with = set() # IDs of foragers mated with
+        self.incompatible_with = set() # IDs of foragers unable to mate with
+        self.visited: VisitedCells = None # Explored cells, created on the first step
+        self.log = deque(maxlen=self.config.log_limit) # Log of action events
         self.chosen_motivations = set()
         self.num_decisions = 0
         self.num_novel_decisions = 0
@@ -83,64 +123,22 @@ class Forager(Mammal):
 
         # * Attributes for analysis
         self.steps_alive = 0 # Number of simulation steps survived
-        self.motivation_metrics = {
-            'food encounters': {
-                'num encounters': 0,
-                'total sustenance gained': 0,
-                'foods tasted': []
-            },
-            'offspring produced': 0,
-            'nearest food': {
-                'times chosen': 0,
-                'successful outcomes': 0,
-                'total time': 0,
-                'average time': 0,
-            },
-            'furthest food': {
-                'times chosen': 0,
-                'successful outcomes': 0,
-                'total time': 0,
-                'average time': 0,
-            },
-            'most sustaining food': {
-                'times chosen': 0,
-                'successful outcomes': 0,
-                'total time': 0,
-                'average time': 0,
-            },
-            'nearest forager': {
-                'times chosen': 0,
-                'successful outcomes': 0,
-                'total time': 0,
-                'average time': 0,
-            },
-            'furthest forager': {
-                'times chosen': 0,
-                'successful outcomes': 0,
-                'total time': 0,
-                'average time': 0,
-            },
-            'most compatible forager': {
-                'times chosen': 0,
-                'successful outcomes': 0,
-                'total time': 0,
-                'average time': 0,
-            },  
-            'hunter encounters': {
-                'num encounters': 0,
-                'times fought': 0,
-                'times fled': 0,
-                'times hidden': 0,
-                'times zig zagged': 0,
-                'times camouflaged': 0,
-                'times won': 0,
-                'times lost': 0
-            },
-            'ravine encounters': {
-                'times jumped': 0,
-                'times attempted': 0,
-            }
-        }
+        self.motivation_metrics = MotivationMetrics(self.config.memory_limit)
+    
+    def join_population(self, population: PopulationStore) -> None:
+        """
+        Moves the foragers genes and state into a row of a population 
+        store.
+
+        Args:
+            population (PopulationStore): The simulations population store.
+        """
+        if self.population is population:
+            return
+        values = {name: getattr(self, name) for name in POPULATION_ATTRIBUTES}
+        self.population_row = population.add_row(values)
+        self.population = population
+        self.detached_values = None
     
     def set_motivation(self, environment, actions: 'ForagerActions') -> str:
         """
@@ -150,8 +148,8 @@ class Forager(Mammal):
             self.current_motivation = actions.set_motivation()
         else:
             self.current_motivation = actions.set_rdm_motivation()
-        self.__log_statement(f'Step {self.simulation_step}: Forager {self.id} is going to find {self.current_motivation}.')
-        self.motivation_metrics[self.current_motivation]['times chosen'] += 1
+        self.__log_event(event_log.MOTIVATION, self.current_motivation)
+        self.motivation_metrics.add(self.current_motivation, MotivationCount.TIMES_CHOSEN)
         environment.total_motivations[self.current_motivation] += 1
     
     def get_next_step(self, environment) -> tuple[int, int]:
@@ -187,21 +185,24 @@ class Forager(Mammal):
         # Get coordinates of destination to find coordinate of next step
         self.destination_coordinates = actions.get_destination_coordinates(self.current_motivation)
         next_coordinate = actions.get_next_coordinate(self.current_coords, self.destination_coordinates)
-        self.explored_coords.append(next_coordinate)
+        if self.visited is None:
+            self.visited = VisitedCells(environment.width, environment.height)
+        self.visited.visit(*next_coordinate)
         
         if self.current_coords == self.destination_coordinates:
             # Motivation has been fulfilled
-            self.__log_statement(f'Step {self.simulation_step}: Forager {self.id} found {self.current_motivation}.')
-            self.motivation_metrics[self.current_motivation]['successful outcomes'] += 1
-            self.motivation_metrics[self.current_motivation]['total time'] += 1
+            self.__log_event(event_log.FOUND, self.current_motivation)
+            self.motivation_metrics.add(self.current_motivation, MotivationCount.SUCCESSFUL_OUTCOMES)
+            self.motivation_metrics.add(self.current_motivation, MotivationCount.TOTAL_TIME)
             self.successful_motivations.append(self.current_motivation) 
             # Set new motivation
             self.set_motivation(environment, actions)
         else:
-            self.motivation_metrics[self.current_motivation]['total time'] += 1
-            self.motivation_metrics[self.current_motivation]['average time'] = str(
-                f"{(self.motivation_metrics[self.current_motivation]['total time'] / environment.num_steps)*100}%"
-            )
+            metrics = self.motivation_metrics
+            metrics.add(self.current_motivation, MotivationCount.TOTAL_TIME)
+            total_time = metrics.get(self.current_motivation, MotivationCount.TOTAL_TIME)
+            metrics.set_average_time(self.current_motivation, 
+                                     (total_time / environment.num_steps) * 100)
         return next_coordinate
             
     def eat(self, food: Food) -> None:
@@ -216,10 +217,10 @@ class Forager(Mammal):
         self.hunger = max((self.hunger - food.sustenance_granted), 0.0)
         self.bravery = max((self.hunger - food.sustenance_granted / 2), 0.0)
         # Log data
-        self.__log_statement(f'Step {self.simulation_step}: {self.id} ate the {food.name}.')
-        self.motivation_metrics['food encounters']['num encounters'] += 1
-        self.motivation_metrics['food encounters']['total sustenance gained'] += food.sustenance_granted
-        self.motivation_metrics['food encounters']['foods tasted'].append(food.name)
+        self.__log_event(event_log.EAT, food.name, food.sustenance_granted)
+        self.motivation_metrics.encounter(Encounter.FOOD_ENCOUNTERS)
+        self.motivation_metrics.total_sustenance_gained += food.sustenance_granted
+        self.motivation_metrics.foods_tasted.append(food.name)
     
     def hunger_increase(self) -> bool:
         """
@@ -234,7 +235,7 @@ class Forager(Mammal):
         self.bravery = min((self.bravery + self.hunger_combin / 2), 10)
         
         if self.hunger == 10:
-            self.__log_statement(f'Step {self.simulation_step}: {self.id} starved.')
+            self.__log_event(event_log.STARVE)
             self.alive = False
 
         return self.alive
@@ -253,22 +254,20 @@ class Forager(Mammal):
         if self.bravery > 5:
             # Forager is fighting the hunter
             decision, win = self.__fight_hunter(hunter)
-            self.motivation_metrics['hunter encounters']['num encounters'] += 1
-            self.motivation_metrics['hunter encounters']['times fought'] += 1
+            self.motivation_metrics.encounter(Encounter.HUNTER_ENCOUNTERS, Encounter.TIMES_FOUGHT)
             if win:
-                self.motivation_metrics['hunter encounters']['times won'] += 1
+                self.motivation_metrics.encounter(Encounter.TIMES_WON)
             else:
-                self.motivation_metrics['hunter encounters']['times lost'] += 1
+                self.motivation_metrics.encounter(Encounter.TIMES_LOST)
             return (decision, win)    
         else:
             # Forager tries to flee
             decision, win = self.__flee_hunter(hunter)
-            self.motivation_metrics['hunter encounters']['num encounters'] += 1
-            self.motivation_metrics['hunter encounters']['times fought'] += 1
+            self.motivation_metrics.encounter(Encounter.HUNTER_ENCOUNTERS, Encounter.TIMES_FOUGHT)
             if win:
-                self.motivation_metrics['hunter encounters']['times won'] += 1
+                self.motivation_metrics.encounter(Encounter.TIMES_WON)
             else:
-                self.motivation_metrics['hunter encounters']['times lost'] += 1
+                self.motivation_metrics.encounter(Encounter.TIMES_LOST)
             return (decision, win)    
     
     def traverse_ravine(self, ravine: Ravine) -> bool:
@@ -292,13 +291,12 @@ class Forager(Mammal):
                         self.perception * weights['perception'])
         
         if weighted_sum > ravine.skill_required:
-            self.__log_statement(f'Step {self.simulation_step}: {self.id} successfully crossed ravine.')
-            self.motivation_metrics['ravine encounters']['times jumped'] += 1
-            self.motivation_metrics['ravine encounters']['times attempted'] += 1
+            self.__log_event(event_log.RAVINE, True)
+            self.motivation_metrics.encounter(Encounter.TIMES_JUMPED, Encounter.TIMES_ATTEMPTED)
             return True
         else:
-            self.__log_statement(f'Step {self.simulation_step}: {self.id} fails to cross ravine.')
-            self.motivation_metrics['ravine encounters']['times attempted'] += 1
+            self.__log_event(event_log.RAVINE, False)
+            self.motivation_metrics.encounter(Encounter.TIMES_ATTEMPTED)
             return False
         
     def is_compatible_with(self, partner: 'Forager') -> bool:
@@ -314,7 +312,7 @@ class Forager(Mammal):
         Returns:
             bool: True, if compatible otherwise false.
         """
-        if partner in self.mated_with:
+        if partner.id in self.mated_with:
             # Don't mate with any forager more than once
             return False
         # Recalculate compatibility as attributes may have changed
@@ -326,30 +324,31 @@ class Forager(Mammal):
             # Foragers are sexually compatible
             if math.isclose(self.compatability_threshold, 
                        partner.compatability_threshold, 
-                       rel_tol=self.config['compat_diff']):
+                       rel_tol=self.compat_diff):
                 # Foragers compatibility thresholds are within compat_diff
-                self.__log_statement(f'Step {self.simulation_step}: {self.id} ({self.sex}: {self.compatability_threshold:.2f}) '
-                                     f'and {partner.id} ({partner.sex}: {partner.compatability_threshold:.2f}) are compatible.')
+                self.__log_mate(partner, True)
                 return True
             else:
                 # Foragers are not compatible
-                self.__log_statement(f'Step {self.simulation_step}: {self.id} ({self.compatability_threshold:.2f}) '
-                                     f'and {partner.id} ({partner.compatability_threshold:.2f}) '
-                                     'are not compatible.')
-                self.incompatible_with.append(partner)
-                self.motivation_metrics[self.current_motivation]['times chosen'] += 1
+                self.__log_mate(partner, False)
+                self.incompatible_with.add(partner.id)
+                self.motivation_metrics.add(self.current_motivation, MotivationCount.TIMES_CHOSEN)
                 return False
         else:
             # Foragers are not compatible
-            self.__log_statement(f'Step {self.simulation_step}: {self.id} ({self.sex}) and {partner.id} '
-                                 f'({partner.sex}) are not compatible.')
-            self.incompatible_with.append(partner)
-            self.motivation_metrics[self.current_motivation]['times chosen'] += 1
+            self.__log_mate(partner, False)
+            self.incompatible_with.add(partner.id)
+            self.motivation_metrics.add(self.current_motivation, MotivationCount.TIMES_CHOSEN)
             return False
     
-    def produce_offspring(self, partner: 'Forager') -> 'Forager':
+    def produce_offspring(self, partner: 'Forager', offspring_id: int = None) -> 'Forager':
         """
         Produces a new forager, with genes dervied from its parents.
+
+        Args:
+            partner (Forager): The other parent.
+            offspring_id (int): ID of the new forager. Given when it is
+                placed if not set here.
         """
         # Get a combination of self and partners genes
         offspring_dict = {
@@ -359,66 +358,40 @@ class Forager(Mammal):
             'endurance': min(10.0, ((self.endurance + partner.endurance) / 2 + random.uniform(3, 4))),
         }
         # Create offspring
-        offspring = Forager(parents_genes=offspring_dict)
+        offspring = Forager(parents_genes=offspring_dict, config=self.config)
+        offspring.id = offspring_id
         
-        self.__log_statement(f'Step {self.simulation_step}: {self.id} and {partner.id} '
-                          f'produced offspring {offspring.id}.')
-        self.mated_with.append(partner)
-        self.motivation_metrics['offspring produced'] += 1
+        self.__log_event(event_log.OFFSPRING, partner.id, offspring.id)
+        self.mated_with.add(partner.id)
+        self.motivation_metrics.encounter(Encounter.OFFSPRING_PRODUCED)
         
         return offspring
     
     def log_genes(self, display: bool, forager_num: int) -> None:
         """
-        Logs changes in genes throughout the simulation.
+        Logs changes in genes throughout the simulation, in the gene 
+        history of the foragers population. Nothing is logged unless the
+        forager is recording this turn.
 
         Args:
-            display (bool): Display changes in stdout.
+            display (bool): Record the genes in the simulations event log.
             forager_num (int): Forager number out of total in simulation.
         """
-        genes = {
-            'id': self.id,
-            'hunger': self.hunger,
-            'bravery': self.bravery,
-            'agility': self.agility,
-            'perception': self.perception,
-            'strength': self.strength,
-            'endurance': self.endurance,
-            'current_coords': self.current_coords,
-            'timestep': len(self.gene_log)
-        }
-        self.gene_log.append([genes])
-        if display:
-            print()
-            print('*' + '-' * 24 + '*')
-            print(f'| Forager {forager_num + 1:<4}| {self.id:<9}|')
-            print('*' + '-' * 24 + '*')
-            # stdout genes
-            a = dict(self.gene_log[-1][0])
-            for key, value in a.items():
-                if isinstance(value, str):
-                    # Don't display attribute
-                    continue
-                elif key == 'timestep':
-                    # Don't display attribute
-                    continue
-                elif key == 'current_coords':
-                    # Format output for even width
-                    label = '(x,y)'
-                    x,y = value
-                    print(f"| {label:<12}| {'('+f'{x:<2}'}, {f'{y:>2}' + ')'} |")
-                else:
-                    # Display a '+' or '-' next to changed attributes
-                    icon = ' '
-                    if len(self.gene_log) > 1:
-                        if dict(self.gene_log[-2][0])[key] > value:
-                            icon = '-'
-                        elif dict(self.gene_log[-2][0])[key] < value:
-                            icon = '+'
-                        else:
-                            icon = ''
-                    print(f'| {key.title():<12}| {value:>6.2f} {icon:<1} |')
-            print('*' + '-' * 24 + '*')
+        if not self.record_actions:
+            return
+        displayed = None
+        markers = None
+        if self.record_genes and self.population is not None:
+            index = self.population.record_history(self.population_row, self.simulation_step)
+            if display:
+                history = self.population.history
+                record = history[index].tolist()
+                # genes followed by (x,y)
+                displayed = list(record[2:8]) + [record[8:10]]
+                markers = history.latest_markers(self.population_row)
+        if self.events is not None:
+            self.events.emit(event_log.TURN, self.simulation_step, forager_num, 
+                             self.id, displayed, markers)
     
     def get_log(self, run_name: str = None) -> None:
         """
@@ -427,9 +400,9 @@ class Forager(Mammal):
         Args:
             run_name (str): Directory name to save file.
         """ 
-        with open(f'logs/{run_name}/forager_logs/{self.id}_log.txt', 'w') as f:
-            for line in self.log:
-                f.write(line)
+        with open(f'logs/{run_name}/forager_logs/{self.alias}_log.txt', 'w') as f:
+            for event in self.log:
+                f.write(render_event(event))
                 f.write('\n')
             
             # attribute table here
@@ -442,7 +415,7 @@ class Forager(Mammal):
             
             f.write('\nTotal Motivation Metrics')
             f.write('\n\n')
-            for k, v in self.motivation_metrics.items():
+            for k, v in self.motivation_metrics.as_dict().items():
                 f.write(f'{k.title()}')
                 f.write('\n')
                 f.write(str(v))
@@ -488,10 +461,10 @@ class Forager(Mammal):
         
         if self_weighted_sum > hunter_weighted_sum:
             hunter.alive = False
-            self.__log_statement(f'Step {self.simulation_step}: {self.id} beat hunter {hunter.id}.')
+            self.__log_event(event_log.FIGHT, hunter.id, True)
         else:
             self.alive = False
-            self.__log_statement(f'Step {self.simulation_step}: {self.id} lost to hunter {hunter.id}.')
+            self.__log_event(event_log.FIGHT, hunter.id, False)
         return ('fight', self.alive)
     
     def __flee_hunter(self, hunter: Hunter) -> tuple[str, bool]:
@@ -514,49 +487,47 @@ class Forager(Mammal):
                                hunter.perception * weights['perception'])
         
         if self_weighted_sum > hunter_weighted_sum:
-            self.__log_statement(f'Step {self.simulation_step}: {self.id} fled hunter {hunter.id}.')
+            self.__log_event(event_log.FLEE, hunter.id, True)
         else:
             self.alive = False
-            self.__log_statement(f'Step {self.simulation_step}: {self.id} was caught by hunter {hunter.id}.')
+            self.__log_event(event_log.FLEE, hunter.id, False)
         return ('flee', self.alive)
     
-    def __validate(self, 
-                   att: float | str, 
-                   att_name: str, 
-                   max: float = 10) -> float | str:
-        """
-        Validates configuration file attributes.
-        """
-        if isinstance(att, float):
-            if max == 1:
-                if att > 1 or att < 0:
-                    raise ValueError(f'config: Value {att} out of range 0-1 '
-                                    f'for {att_name}.\n')
-            if max == 10.0:
-                if att > 10.0 or att < 0.0:
-                    raise ValueError(f'config: Value {att} out of range 0.0-10.0 '
-                                    f'for {att_name}.\n')
-        if att_name == 'novelty_search':
-            if att != True and att != False:
-                raise ValueError(f'config: {att_name} must be \'True\' or \'False\'. Current value: {att}')
-        return att
+    def __log_event(self, kind: str, *details) -> None:
+        """
+        Saves a forager action and records it in the simulations event log.
+        Nothing is built unless the forager is recording this turn.
+        """
+        if not self.record_actions:
+            return
+        event = (kind, self.simulation_step, self.id, *details)
+        self.log.append(event)
+        if self.events is not None:
+            self.events.emit(*event)
     
-    def __log_statement(self, statement: str) -> None:
+    def __log_mate(self, partner: 'Forager', compatible: bool) -> None:
         """
-        Saves and outputs forager actions to stdout.
+        Saves the outcome of a compatibility check.
         """
-        print(statement)
-        self.log.append(statement)
+        if not self.record_actions:
+            return
+        self.__log_event(event_log.MATE, self.sex, self.compatability_threshold,
+                         partner.id, partner.sex, partner.compatability_threshold,
+                         compatible)
                     
     def __alive(self) -> 'InvalidForager':
         """
         Check to ensure dead foragers do not perform actions.
         """
         if self.alive == False:
-            raise InvalidForager(self.id)
+            raise InvalidForager(self.alias)
         
     def __str__(self) -> str:
-        return f'Forager {self.id}.\n'
+        return f'Forager {self.alias}.\n'
+
+# Forager attributes held in the population store
+POPULATION_ATTRIBUTES = [name for name, value in vars(Forager).items() 
+                         if isinstance(value, PopulationColumn)]
 
 class InvalidForager(Exception):
     """
@@ -575,10 +546,14 @@ class ForagerActions():
     def __init__(self, environment, forager: Forager):
         self.environment = environment
         self.forager = forager
-        # All foods and foragers in the environment
-        self.foods = self.__find_all(Food)
-        self.foragers = self.__find_all(Forager)
-        self.hunters = self.__find_all(Hunter)
+        # All foods, foragers and hunters in the environment as 
+        # (object, (x,y)) pairs. These lists are shared by every forager
+        # and must not be modified. The foragers include this forager,
+        # which the forager queries skip.
+        index = environment.entity_index
+        self.foods = index.locate(Food)
+        self.hunters = index.locate(Hunter)
+        self.foragers = index.locate(Forager)
         
     def set_rdm_motivation(self) -> str:
         """
@@ -717,7 +692,11 @@ class ForagerActions():
         Returns:
             tuple: (x,y) coordinates of destination.
         """
-        target_coords = None
+        # Distance based destinations are resolved for every forager at 
+        # the start of the step. Food may have been eaten since then.
+        target_coords = self.__step_destination(motivation)
+        if target_coords is not None:
+            return target_coords
         if motivation == 'nearest food':
             target_coords = self.__find_nearest_food()
         elif motivation == 'furthest food':
@@ -786,52 +765,13 @@ class ForagerActions():
             steps.append(next_coord)
         return steps
     
-    def __find_all(self, object_class: Food | Forager | Hunter) -> list:
-        """
-        Finds all coordinates of food, foragers or hunters in the
-        simulation.
-
-        Args:
-            object_class (Food | Forager | Hunter): Object class.
-
-        Returns:
-            list: List of coordinates where objects reside.
-        """
-        objs = []
-        # Iterate through environment
-        for y in range(self.environment.height):
-            for x in range(self.environment.width):
-                if isinstance(self.environment.grid[y][x], object_class):
-                    simulation_obj = self.environment.grid[y][x]
-                    obj_dict = {}
-                    if simulation_obj.id == self.forager.id:
-                        # Ignore own location
-                        continue
-                    # Gets details about objects
-                    if object_class == Food:
-                        obj_dict['id'] = simulation_obj.id
-                        obj_dict['type'] = 'Food'
-                        obj_dict['key_attribute'] = simulation_obj.sustenance_granted
-                        obj_dict['location'] = (x,y)
-                    elif object_class == Forager:
-                        obj_dict['type'] = 'Forager'
-                        obj_dict['key_attribute'] = simulation_obj.compatability_threshold
-                        obj_dict['location'] = (x,y)
-                    elif object_class == Hunter:
-                        obj_dict['id'] = simulation_obj.id
-                        obj_dict['type'] = 'Hunter'
-                        obj_dict['key_attribute'] = simulation_obj.strength
-                        obj_dict['location'] = (x,y)
-                    objs.append(obj_dict)
-        return objs
-        
     def __find_nearest_food(self) -> tuple[int, int]:
         """
         Finds the (x,y) coordinate of the nearest food.
         """
         food_locations = []
-        for food in self.foods:
-            food_locations.append(food['location'])
+        for _, location in self.foods:
+            food_locations.append(location)
         output = self.__get_nearest(food_locations)
         if output == None:
             raise ValueError(f'Output: {output}')
@@ -842,8 +782,8 @@ class ForagerActions():
         Finds the (x,y) coordinate of the furthest food.
         """
         food_locations = []
-        for food in self.foods:
-            food_locations.append(food['location'])
+        for _, location in self.foods:
+            food_locations.append(location)
         output = self.get_furthest(food_locations)
         if output == None:
             raise ValueError(f'Output: {output}')
@@ -855,14 +795,14 @@ class ForagerActions():
         """
         food_locations = []
         food_sus = float('inf')
-        for food in self.foods:
-            if food['key_attribute'] < food_sus:
-                food_sus = food['key_attribute']
-                food_locations.append(food)
+        for food, location in self.foods:
+            if food.sustenance_granted < food_sus:
+                food_sus = food.sustenance_granted
+                food_locations.append(location)
         if len(food_locations) > 0:
-            output = food_locations[-1]['location']
+            output = food_locations[-1]
         else: 
-            output = food_locations[0]['location']
+            output = food_locations[0]
             
         if output == None:
             raise ValueError(f'Output: {output}')
@@ -872,15 +812,13 @@ class ForagerActions():
         """
         Finds the (x,y) coordinate of the nearest forager.
         """
-        if len(self.foragers) == 0:
+        forager_locations = self.__other_forager_locations()
+        if len(forager_locations) == 0:
             output = self.__find_nearest_food()
             if output == None:
                 raise ValueError(f'Output: {output}')
             return output
         else:
-            forager_locations = []
-            for forager in self.foragers:
-                forager_locations.append(forager['location'])
             output = self.__get_nearest(forager_locations)
             if output == None:
                 raise ValueError(f'Output: {output}')
@@ -890,86 +828,67 @@ class ForagerActions():
         """
         Finds the (x,y) coordinate of the furthest forager.
         """
-        if len(self.foragers) == 0:
+        forager_locations = self.__other_forager_locations()
+        if len(forager_locations) == 0:
             output = self.__find_furthest_food()
             if output == None:
                 raise ValueError(f'Output: {output}')
-            return self.__find_furthest_food()
+            return output
         else:
-            forager_locations = []
-            for forager in self.foragers:
-                forager_locations.append(forager['location'])
             output = self.get_furthest(forager_locations)
             if output == None:
                 raise ValueError(f'Output: {output}')
-            return self.get_furthest(forager_locations)
+            return output
         
     def __find_most_compatible_forager(self) -> tuple[int, int]:
         """
         Finds the (x,y) coordinate of the forager with the most similar
         compatibility threshold.
         """
-        if len(self.foragers) == 0:
+        if not any(other is not self.forager for other, _ in self.foragers):
             # no potential mates
             # go and look for food
             return self.__find_most_sustenance()
         else:
             forager_locations = []
             compatibility = float('inf')
-            for forager in self.foragers:
-                if forager['key_attribute'] < compatibility:
-                    compatibility = forager['key_attribute']
-                    forager_locations.append(forager)
-            output = forager_locations[-1]['location']
+            for forager, location in self.foragers:
+                if forager is self.forager:
+                    continue
+                if forager.compatability_threshold < compatibility:
+                    compatibility = forager.compatability_threshold
+                    forager_locations.append(location)
+            output = forager_locations[-1]
             if output == None:
                 raise ValueError(f'Output: {output}')
             return output
         
-    def __manhattan_distance(self, object_loc: tuple[int, int]) -> int:
+    def __other_forager_locations(self) -> list[tuple[int, int]]:
         """
-        Manhattan distance between self.current_forager and object.
-
-        Args:
-            object_loc (tuple(int,int)): x, y coordinate of object.
+        (x,y) coordinates of every forager except this one.
         """
-        return (abs(object_loc[0] - self.forager.current_coords[0]) + 
-                abs(object_loc[1] - self.forager.current_coords[1]))
-    
-    def __sort_by_nearest(self, locations: list) -> list:
-        """
-        Sort distance of food or foragers in ascending order.
+        forager = self.forager
+        return [location for other, location in self.foragers if other is not forager]
 
-        Args:
-            locations (list): List of (x,y) coordinates.
-
-        Returns:
-            list: Sorted list of (x,y) coordinates.
-        """
-        objs = []
-        closest_obj = None
-        shortest_distance = float('inf')    
-        for obj_loc in locations:
-            distance = self.__manhattan_distance(obj_loc)
-            if distance < shortest_distance:
-                shortest_distance = distance
-                closest_obj = obj_loc
-                objs.append(closest_obj)
-        return objs
-    
-    def __sort_by_furthest(self, locations: list) -> list:
+    def __step_destination(self, motivation: str) -> tuple[int, int] | None:
         """
-        Sort a list of food or forager objects in descending order.
-
-        Args:
-            locations (list): List of (x,y) coordinates.
+        Gets the destination resolved for this forager at the start of the
+        simulation step, if it is still valid.
 
         Returns:
-            list: Sorted list of (x,y) coordinates.
-        """
-        objs = self.__sort_by_nearest(locations)
-        objs.reverse()
-        return objs
-    
+            tuple | None: (x,y) coordinates of destination, or None if it
+                must be found again.
+        """
+        step_targets = self.environment.step_targets
+        if step_targets is None:
+            return None
+        target_coords = step_targets.destination(self.forager, motivation)
+        if target_coords is not None and motivation in ('nearest food', 'furthest food'):
+            if not isinstance(self.environment.grid.get(*target_coords), Food):
+                # Food has been eaten
+                return None
+        return target_coords
+
     def __get_nearest(self, locations: list) -> tuple[int, int]:
         """
         Get the coordinates of the nearest food or forager.
@@ -980,8 +899,8 @@ class ForagerActions():
         Returns:
             tuple: (x,y) coordinate of the nearest object
         """
-        objs = self.__sort_by_nearest(locations)
-        return objs[0]
+        nearest, _ = nearest_and_furthest([self.forager.current_coords], locations)
+        return locations[nearest[0]] if nearest[0] >= 0 else None
     
     def get_furthest(self, locations: list) -> tuple[int, int]:
         """
@@ -993,8 +912,8 @@ class ForagerActions():
         Returns:
             tuple: (x,y) coordinate of the furthest object.
         """
-        objs = self.__sort_by_furthest(locations)
-        return objs[0]
+        _, furthest = nearest_and_furthest([self.forager.current_coords], locations)
+        return locations[furthest[0]] if furthest[0] >= 0 else None
         
 class TargetError(Exception):
     """
@@ -0,0 +1,92 @@
+import os
+import tomllib
+from dataclasses import dataclass
+from functools import lru_cache
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'forager_config.toml')
+
+@dataclass(frozen=True)
+class ForagerConfig():
+    """
+    Forager configuration, validated once and shared by every forager in
+    a simulation.
+
+    Can be created directly to configure a simulation programmatically,
+    or loaded from a toml file with `ForagerConfig.from_toml()`.
+    """
+    novelty_search: bool = False
+    hunger: float = 3
+    bravery: float = 3
+    compat_diff: float = 0.3
+    decay_factor: float = 0.98
+    hunger_combinator: float = 0.1
+    positive_multiplier: float = 0.25
+    # Most recent entries each forager keeps in its log and in lists
+    # such as its successful motivations and foods tasted
+    log_limit: int = 1000
+    memory_limit: int = 100
+
+    def __post_init__(self) -> None:
+        self.__validate(self.hunger, 'hunger')
+        self.__validate(self.bravery, 'bravery')
+        self.__validate(self.compat_diff, 'compat_diff', 1)
+        self.__validate(self.decay_factor, 'decay_factor', 1)
+        self.__validate(self.hunger_combinator, 'hunger_combinator', 1)
+        self.__validate(self.positive_multiplier, 'positive_multiplier', 1)
+        self.__validate_limit(self.log_limit, 'log_limit')
+        self.__validate_limit(self.memory_limit, 'memory_limit')
+        if self.novelty_search is not True and self.novelty_search is not False:
+            raise ValueError(f'config: novelty_search must be \'True\' or \'False\'. '
+                             f'Current value: {self.novelty_search}')
+
+    @classmethod
+    def from_toml(cls, path: str = DEFAULT_CONFIG_PATH) -> 'ForagerConfig':
+        """
+        Loads and validates a configuration file.
+
+        Args:
+            path (str): Path to the toml file. Defaults to
+                `forager_config.toml` next to this module.
+
+        Returns:
+            ForagerConfig: The configuration.
+        """
+        with open(path, 'rb') as f:
+            config = tomllib.load(f)
+        return cls(
+            novelty_search=config['novelty_search'],
+            hunger=config['hunger'],
+            bravery=config['bravery'],
+            compat_diff=config['compat_diff'],
+            decay_factor=config['decay_factor'],
+            hunger_combinator=config['hunger_combinator'],
+            positive_multiplier=config['positive_multiplier'],
+            log_limit=config.get('log_limit', cls.log_limit),
+            memory_limit=config.get('memory_limit', cls.memory_limit),
+        )
+
+    def __validate(self, att: float, att_name: str, max: float = 10) -> None:
+        """
+        Validates configuration attributes.
+        """
+        if isinstance(att, bool) or not isinstance(att, (int, float)):
+            raise TypeError(f'config: {att_name} must be a number. Current value: {att}')
+        if att > max or att < 0:
+            raise ValueError(f'config: Value {att} out of range 0-{max} '
+                             f'for {att_name}.\n')
+
+    def __validate_limit(self, att: int, att_name: str) -> None:
+        """
+        Validates limits on the size of forager memory.
+        """
+        if isinstance(att, bool) or not isinstance(att, int):
+            raise TypeError(f'config: {att_name} must be a whole number. Current value: {att}')
+        if att < 1:
+            raise ValueError(f'config: {att_name} must be at least 1. Current value: {att}')
+
+@lru_cache(maxsize=None)
+def default_config() -> ForagerConfig:
+    """
+    The configuration in `forager_config.toml`, loaded on first use.
+    """
+    return ForagerConfig.from_toml()
@@ -0,0 +1,140 @@
+import numpy as np
+from numpy.lib import recfunctions
+
+# Genes recorded at each forager turn, in display order
+GENES = ['hunger', 'bravery', 'agility', 'perception', 'strength', 'endurance']
+
+RECORD_DTYPE = np.dtype(
+    [('handle', np.int32), ('step', np.int32)] +
+    [(gene, np.float64) for gene in GENES] +
+    [('x', np.int32), ('y', np.int32)]
+)
+
+# Marker for a gene that went down, stayed the same or went up
+MARKERS = np.array(['-', '', '+'])
+
+class GeneHistory():
+    """
+    The genes and position of foragers at each turn, stored as a NumPy
+    record array in preallocated chunks.
+
+    Records are (handle, step, hunger, bravery, agility, perception,
+    strength, endurance, x, y), where handle is the foragers row in the
+    population store.
+    """
+    def __init__(self, chunk_size: int = 4096) -> None:
+        self.chunk_size = chunk_size
+        self.__chunks = [np.empty(chunk_size, dtype=RECORD_DTYPE)]
+        self.__size = 0
+        # handle -> index of its latest and previous records
+        self.__latest = {}
+        self.__previous = {}
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def record(self, record: tuple) -> int:
+        """
+        Adds a record, allocating a new chunk when the last one is full.
+
+        Args:
+            record (tuple): Values in the order of `RECORD_DTYPE`.
+
+        Returns:
+            int: Index of the record.
+        """
+        index = self.__size
+        chunk, offset = divmod(index, self.chunk_size)
+        if chunk == len(self.__chunks):
+            self.__chunks.append(np.empty(self.chunk_size, dtype=RECORD_DTYPE))
+        self.__chunks[chunk][offset] = record
+        self.__size += 1
+        handle = record[0]
+        if handle in self.__latest:
+            self.__previous[handle] = self.__latest[handle]
+        self.__latest[handle] = index
+        return index
+
+    def __getitem__(self, index: int) -> np.void:
+        chunk, offset = divmod(index, self.chunk_size)
+        return self.__chunks[chunk][offset]
+
+    def records(self) -> np.ndarray:
+        """
+        Every record in order, copied into one array.
+        """
+        filled = list(self.__chunks[:self.__size // self.chunk_size])
+        remainder = self.__size % self.chunk_size
+        if remainder:
+            filled.append(self.__chunks[self.__size // self.chunk_size][:remainder])
+        if not filled:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return np.concatenate(filled)
+
+    def save(self, path: str) -> None:
+        """
+        Saves every record to a `.npy` file.
+        """
+        np.save(path, self.records())
+
+    def query(self,
+              handle: int = None,
+              start_step: int = None,
+              stop_step: int = None) -> np.ndarray:
+        """
+        Gets records of one forager and/or a range of steps.
+
+        Args:
+            handle (int): Forager handle, or None for every forager.
+            start_step (int): First step, inclusive.
+            stop_step (int): Last step, exclusive.
+
+        Returns:
+            np.ndarray: Matching records in order.
+        """
+        records = self.records()
+        keep = np.ones(len(records), dtype=bool)
+        if handle is not None:
+            keep &= records['handle'] == handle
+        if start_step is not None:
+            keep &= records['step'] >= start_step
+        if stop_step is not None:
+            keep &= records['step'] < stop_step
+        return records[keep]
+
+    def latest_markers(self, handle: int) -> list[str]:
+        """
+        Markers for the change in each gene between a foragers latest
+        record and the one before it.
+        """
+        previous = self.__previous.get(handle)
+        if previous is None:
+            return [' '] * len(GENES)
+        records = np.array([self[previous], self[self.__latest[handle]]])
+        return change_markers(records)[1].tolist()
+
+def change_markers(records: np.ndarray) -> np.ndarray:
+    """
+    Marks each gene of each record with '+' or '-' if it went up or down
+    since the previous record of the same forager, '' if it did not
+    change, or ' ' if there is no previous record.
+
+    Args:
+        records (np.ndarray): Records in the order they were made.
+
+    Returns:
+        np.ndarray: (N, 6) array of markers, one column per gene.
+    """
+    genes = recfunctions.structured_to_unstructured(records[GENES])
+    # Group records of the same forager, keeping them in order
+    order = np.argsort(records['handle'], kind='stable')
+    handles = records['handle'][order]
+    ordered = genes[order]
+    markers = np.full(genes.shape, ' ', dtype=MARKERS.dtype)
+    has_previous = np.zeros(len(records), dtype=bool)
+    has_previous[1:] = handles[1:] == handles[:-1]
+    change = np.sign(ordered[1:] - ordered[:-1]).astype(int) + 1
+    ordered_markers = np.full(genes.shape, ' ', dtype=MARKERS.dtype)
+    ordered_markers[1:][has_previous[1:]] = MARKERS[change[has_previous[1:]]]
+    markers[order] = ordered_markers
+    return markers
@@ -6,6 +6,8 @@ class Hunter(Mammal):
     """
     Predators that fight foragers, or cause them to flee.
     """
+    __slots__ = ('alive', 'current_coords')
+
     def __init__(self) -> None:
         attributes = self.create_hunter()
         super().__init__(
@@ -16,6 +18,7 @@ class Hunter(Mammal):
         )
         self.type = 'Hunter'
         self.alive = True
+        self.current_coords = None
         
     def create_hunter(self) -> dict:
         """
@@ -33,7 +36,7 @@ class Hunter(Mammal):
         return d
     
     def get_next_move(self, 
-                      grid: list, 
+                      grid, 
                       grid_height: int, 
                       grid_width: int) -> tuple[tuple, tuple]:
             """
@@ -41,39 +44,24 @@ class Hunter(Mammal):
             If there are no empty spaces, the hunter remains still.
             
             Args:
-                grid (list): The simulation and its contents
+                grid (ObjectGrid | ArrayGrid): The simulation and its contents
                 grid_height (int): Height of grid
                 grid_width (int): Width of grid
             """
-            current_position = None
+            x, y = self.current_coords
             potential_moves = []
-            for y in range(grid_height-1):
-                for x in range(grid_width-1):
-                        if isinstance(grid[y][x], Hunter):
-                            hunter = grid[y][x]
-                            if hunter.id != self.id:
-                                continue
-                            # save current position
-                            current_position = (x,y)
-                            # cell above is empty
-                            if 0 <= y - 1 <= grid_height and grid[y - 1][x] == None:
-                                potential_moves.append((x, y - 1))
-                            # cell below is empty
-                            elif 0 <= y + 1 <= grid_height and grid[y + 1][x] == None:
-                                potential_moves.append((x, y + 1))
-                            # cell to the left is empty
-                            elif 0 <= x - 1 <= grid_width and grid[y][x - 1] == None:
-                                potential_moves.append((x - 1, y))
-                            # cell to the right is empty
-                            elif 0 <= x + 1 <= grid_width and grid[y][x + 1] == None:
-                                potential_moves.append((x + 1, y))
-                new_position = (random.choice(potential_moves) 
-                                if len(potential_moves) > 0 else current_position)
-            return current_position, new_position
+            # cells above, below, to the left and to the right
+            for new_x, new_y in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+                if (0 <= new_x < grid_width and 0 <= new_y < grid_height 
+                    and grid.is_empty(new_x, new_y)):
+                    potential_moves.append((new_x, new_y))
+            new_position = (random.choice(potential_moves) 
+                            if len(potential_moves) > 0 else self.current_coords)
+            return self.current_coords, new_position
         
     def __str__(self) -> str:
         """
         Overload str method for more informative output when printing.
         """
-        return f'Hunter {self.id}.\n'
+        return f'Hunter {self.alias}.\n'
     
\ No newline at end of file
@@ -1,31 +1,35 @@
-import shortuuid
+from .entity_ids import id_alias
 
 class Mammal():
     """
     Superclass for hunters and foragers.
     """
+    __slots__ = ('id', 'agility', 'perception', 'strength', 'endurance', 'type')
+
     def __init__(self, 
                  agility: float, 
                  perception: float, 
                  strength: float, 
                  endurance: float) -> None:
-        self.id = self.generate_id()
+        # Given by the simulation when placed
+        self.id = None
         self.agility = self.__validate(agility, 'agility')
         self.perception = self.__validate(perception, 'perception')
         self.strength = self.__validate(strength, 'strength')
         self.endurance = self.__validate(endurance, 'endurance')     
     
-    def generate_id(self) -> str:
+    @property
+    def alias(self) -> str:
         """
-        A unique ID for the mammal.
+        Short string for the ID, used in logs. None until placed.
         """
-        return shortuuid.random(length=4)
+        return None if self.id is None else id_alias(self.id)
     
     def display_attributes(self) -> None:
         """
         Display all mammal attributes in a table
         """
-        id_len = len(vars(self)['id'])
+        id_len = len(str(self.alias))
         v_length = max(12, id_len)
         t_length = 28 + v_length
         att = 'Attribute'
@@ -34,8 +38,10 @@ class Mammal():
         print(h_line)
         print(f'| {att:<23} | {val:>{v_length}} |')
         print(h_line)
-        for key, value in vars(self).items():
-            if isinstance(value, (float, int)) and key != 'alive':
+        for key, value in self.__attributes().items():
+            if key == 'id':
+                print(f'| {key.title():<23} | {str(self.alias):>{v_length}} |')
+            elif isinstance(value, (float, int)) and key != 'alive':
                 print(f'| {key.title():<23} | '
                       f'{str(round(value, 2)):>{v_length}} |')
             else:
@@ -53,10 +59,24 @@ class Mammal():
                     continue
                 elif key == 'attribute_log':
                     continue
+                elif key in ('population', 'population_row', 'detached_values'):
+                    continue
                 else:
                     print(f'| {key.title():<23} | {str(value):>{v_length}} |')
         print(h_line + '\n')
 
+    def __attributes(self) -> dict:
+        """
+        Every attribute that has been set, by name, in the order the 
+        classes declare them.
+        """
+        attributes = {}
+        for cls in reversed(type(self).__mro__):
+            for name in getattr(cls, '__slots__', ()):
+                if hasattr(self, name):
+                    attributes[name] = getattr(self, name)
+        return attributes
+
     def __validate(self, arg_value: float, arg_name: str) -> float:
         """
         Validates attribute values and type.
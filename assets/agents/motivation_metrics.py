@@ -0,0 +1,134 @@
+import math
+from array import array
+from collections import deque
+from enum import IntEnum
+
+class Motivation(IntEnum):
+    """
+    Motivations a forager can choose, in the order they are offered.
+    """
+    NEAREST_FOOD = 0
+    FURTHEST_FOOD = 1
+    MOST_SUSTAINING_FOOD = 2
+    NEAREST_FORAGER = 3
+    FURTHEST_FORAGER = 4
+    MOST_COMPATIBLE_FORAGER = 5
+
+    @property
+    def label(self) -> str:
+        """
+        The name used in logs, e.g. 'nearest food'.
+        """
+        return self.name.lower().replace('_', ' ')
+
+# Motivation name -> Motivation
+MOTIVATIONS = {motivation.label: motivation for motivation in Motivation}
+
+class MotivationCount(IntEnum):
+    """
+    Counters kept for each motivation.
+    """
+    TIMES_CHOSEN = 0
+    SUCCESSFUL_OUTCOMES = 1
+    TOTAL_TIME = 2
+
+class Encounter(IntEnum):
+    """
+    Counters for what happens to a forager.
+    """
+    FOOD_ENCOUNTERS = 0
+    OFFSPRING_PRODUCED = 1
+    HUNTER_ENCOUNTERS = 2
+    TIMES_FOUGHT = 3
+    TIMES_FLED = 4
+    TIMES_HIDDEN = 5
+    TIMES_ZIG_ZAGGED = 6
+    TIMES_CAMOUFLAGED = 7
+    TIMES_WON = 8
+    TIMES_LOST = 9
+    TIMES_JUMPED = 10
+    TIMES_ATTEMPTED = 11
+
+# Initial values, copied for each forager
+ZERO_COUNTS = array('q', bytes(8 * len(Motivation) * len(MotivationCount)))
+UNSET_AVERAGE_TIMES = array('d', [math.nan] * len(Motivation))
+ZERO_ENCOUNTERS = array('q', bytes(8 * len(Encounter)))
+
+class MotivationMetrics():
+    """
+    Counts of what a forager chose and encountered, stored in flat integer
+    arrays indexed by `Motivation`, `MotivationCount` and `Encounter`.
+    """
+    __slots__ = ('counts', 'average_time', 'encounters', 'total_sustenance_gained',
+                 'foods_tasted')
+
+    def __init__(self, memory_limit: int = 100) -> None:
+        """
+        Args:
+            memory_limit (int): Number of recent foods tasted to keep.
+        """
+        # motivation * len(MotivationCount) + count
+        self.counts = ZERO_COUNTS[:]
+        # Percentage of the simulation spent on each motivation, NaN until set
+        self.average_time = UNSET_AVERAGE_TIMES[:]
+        self.encounters = ZERO_ENCOUNTERS[:]
+        self.total_sustenance_gained = 0
+        self.foods_tasted = deque(maxlen=memory_limit)
+
+    def add(self, motivation: str, count: MotivationCount, amount: int = 1) -> None:
+        """
+        Adds to a counter of a motivation, given by name.
+        """
+        self.counts[MOTIVATIONS[motivation] * len(MotivationCount) + count] += amount
+
+    def get(self, motivation: str, count: MotivationCount) -> int:
+        return self.counts[MOTIVATIONS[motivation] * len(MotivationCount) + count]
+
+    def set_average_time(self, motivation: str, percentage: float) -> None:
+        self.average_time[MOTIVATIONS[motivation]] = percentage
+
+    def encounter(self, *encounters: Encounter) -> None:
+        """
+        Adds one to each encounter counter given.
+        """
+        for encounter in encounters:
+            self.encounters[encounter] += 1
+
+    def as_dict(self) -> dict:
+        """
+        The metrics as nested dictionaries, as written to forager logs.
+        """
+        def count(encounter: Encounter) -> int:
+            return self.encounters[encounter]
+
+        metrics = {
+            'food encounters': {
+                'num encounters': count(Encounter.FOOD_ENCOUNTERS),
+                'total sustenance gained': self.total_sustenance_gained,
+                'foods tasted': list(self.foods_tasted),
+            },
+            'offspring produced': count(Encounter.OFFSPRING_PRODUCED),
+        }
+        for motivation in Motivation:
+            average_time = self.average_time[motivation]
+            metrics[motivation.label] = {
+                'times chosen': self.get(motivation.label, MotivationCount.TIMES_CHOSEN),
+                'successful outcomes': self.get(motivation.label, MotivationCount.SUCCESSFUL_OUTCOMES),
+                'total time': self.get(motivation.label, MotivationCount.TOTAL_TIME),
+                'average time': 0 if math.isnan(average_time) else f'{average_time}%',
+            }
+        metrics['hunter encounters'] = {
+            'num encounters': count(Encounter.HUNTER_ENCOUNTERS),
+            'times fought': count(Encounter.TIMES_FOUGHT),
+            'times fled': count(Encounter.TIMES_FLED),
+            'times hidden': count(Encounter.TIMES_HIDDEN),
+            'times zig zagged': count(Encounter.TIMES_ZIG_ZAGGED),
+            'times camouflaged': count(Encounter.TIMES_CAMOUFLAGED),
+            'times won': count(Encounter.TIMES_WON),
+            'times lost': count(Encounter.TIMES_LOST),
+        }
+        metrics['ravine encounters'] = {
+            'times jumped': count(Encounter.TIMES_JUMPED),
+            'times attempted': count(Encounter.TIMES_ATTEMPTED),
+        }
+        return metrics
@@ -0,0 +1,143 @@
+import numpy as np
+
+from .gene_history import GeneHistory
+
+class PopulationStore():
+    """
+    Genes and state of every forager in a simulation, stored as NumPy
+    columns with one row per forager.
+
+    A forager keeps the same row for the whole simulation, so rows can be
+    used as stable handles. `listed` counts how many times each forager
+    appears in the simulations list of foragers.
+    """
+    COLUMNS = {
+        'agility': np.float64,
+        'perception': np.float64,
+        'strength': np.float64,
+        'endurance': np.float64,
+        'hunger': np.float64,
+        'bravery': np.float64,
+        'steps_alive': np.int64,
+        'alive': np.bool_,
+        'x': np.int32,
+        'y': np.int32,
+        'listed': np.int32,
+    }
+
+    def __init__(self, capacity: int = 64) -> None:
+        self.size = 0
+        self.__columns = {name: np.zeros(capacity, dtype=dtype)
+                          for name, dtype in self.COLUMNS.items()}
+        # Genes and position of each forager at each of its turns
+        self.history = GeneHistory()
+
+    def add_row(self, values: dict) -> int:
+        """
+        Adds a forager to the store.
+
+        Args:
+            values (dict): Initial value of each forager attribute.
+
+        Returns:
+            int: The foragers row.
+        """
+        if self.size == len(self.__columns['alive']):
+            self.__grow()
+        row = self.size
+        self.size += 1
+        for name, value in values.items():
+            self.set(row, name, value)
+        return row
+
+    def get(self, row: int, name: str):
+        """
+        Gets a single forager attribute.
+        """
+        if name == 'current_coords':
+            x = self.__columns['x'][row]
+            return None if x < 0 else (int(x), int(self.__columns['y'][row]))
+        return self.__columns[name][row].item()
+
+    def set(self, row: int, name: str, value) -> None:
+        """
+        Sets a single forager attribute.
+        """
+        if name == 'current_coords':
+            x, y = value if value is not None else (-1, -1)
+            self.__columns['x'][row] = x
+            self.__columns['y'][row] = y
+        else:
+            self.__columns[name][row] = value
+
+    def record_history(self, row: int, step: int) -> int:
+        """
+        Records a foragers current genes and position in the history.
+
+        Returns:
+            int: Index of the record.
+        """
+        c = self.__columns
+        return self.history.record((row, step, 
+                                    c['hunger'][row], c['bravery'][row],
+                                    c['agility'][row], c['perception'][row],
+                                    c['strength'][row], c['endurance'][row],
+                                    c['x'][row], c['y'][row]))
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Gets an attribute of every forager in the store, by row.
+        The returned array is a view and must not be modified.
+        """
+        return self.__columns[name][:self.size]
+
+    def listed_mean(self, name: str) -> float:
+        """
+        Average of an attribute over the foragers in the simulations list
+        of foragers.
+        """
+        listed = self.column('listed')
+        return float(np.dot(self.column(name), listed) / listed.sum())
+
+    def num_listed(self) -> int:
+        """
+        Number of entries in the simulations list of foragers.
+        """
+        return int(self.column('listed').sum())
+
+    def retire(self, age_limit: int) -> None:
+        """
+        Foragers in the simulation that have reached the age limit die.
+        """
+        old = (self.column('listed') > 0) & (self.column('steps_alive') >= age_limit)
+        self.__columns['alive'][:self.size][old] = False
+
+    def __grow(self) -> None:
+        """
+        Doubles the capacity of every column.
+        """
+        for name, column in self.__columns.items():
+            grown = np.zeros(len(column) * 2, dtype=column.dtype)
+            grown[:len(column)] = column
+            self.__columns[name] = grown
+
+class PopulationColumn():
+    """
+    Forager attribute held in a PopulationStore row once the forager has
+    been added to a simulation, and on the forager itself before then.
+    """
+    def __set_name__(self, owner, name: str) -> None:
+        self.name = name
+
+    def __get__(self, forager, owner=None):
+        if forager is None:
+            return self
+        if forager.population is None:
+            return forager.detached_values[self.name]
+        return forager.population.get(forager.population_row, self.name)
+
+    def __set__(self, forager, value) -> None:
+        if forager.population is None:
+            forager.detached_values[self.name] = value
+        else:
+            forager.population.set(forager.population_row, self.name, value)
@@ -1,5 +1,5 @@
 from random import uniform, randrange
-import shortuuid
+from .entity_ids import id_alias
 
 class Ravine():
     """
@@ -7,20 +7,24 @@ class Ravine():
     Foragers with the right attributes can jump over them.
     Hunters, and foragers that cannot jump, have to walk around.
     """
+    __slots__ = ('id', 'skill_required', 'width', 'height')
+
     def __init__(self, grid_width: int) -> None:
-        self.id = self.generate_id()
+        # Given by the simulation when placed
+        self.id = None
         self.skill_required = round(uniform(0.1, 0.7), 2) * 10
         self.width = randrange(1, grid_width//2)
         self.height = randrange(1, grid_width//2)
         
-    def generate_id(self) -> str:
+    @property
+    def alias(self) -> str:
         """
-        A unique ID for the ravine.
+        Short string for the ID, used in logs. None until placed.
         """
-        return shortuuid.random(length=4)
+        return None if self.id is None else id_alias(self.id)
         
     def __str__(self) -> str:
         """
         Overload str method for more informative output when printing.
         """
-        return f'Ravine {self.id} requires {self.skill_required} skill.\n'
\ No newline at end of file
+        return f'Ravine {self.alias} requires {self.skill_required} skill.\n'
\ No newline at end of file
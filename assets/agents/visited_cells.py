@@ -0,0 +1,35 @@
+class VisitedCells():
+    """
+    The cells a forager has stepped towards, stored as one bit per cell
+    of the grid so its size does not grow with the foragers lifetime.
+    """
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.count = 0
+        self.__bits = bytearray((width * height + 7) // 8)
+
+    def visit(self, x: int, y: int) -> None:
+        """
+        Marks (x,y) as visited. Cells outside the grid are ignored.
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return
+        byte, bit = divmod(y * self.width + x, 8)
+        mask = 1 << bit
+        if not self.__bits[byte] & mask:
+            self.__bits[byte] |= mask
+            self.count += 1
+
+    def __contains__(self, cell: tuple[int, int]) -> bool:
+        x, y = cell
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        byte, bit = divmod(y * self.width + x, 8)
+        return bool(self.__bits[byte] & (1 << bit))
+
+    def coverage(self) -> float:
+        """
+        Share of the grid visited.
+        """
+        return self.count / (self.width * self.height)
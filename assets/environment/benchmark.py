@@ -0,0 +1,233 @@
+import json
+import os
+import platform
+import random
+import statistics
+import time
+from dataclasses import dataclass, asdict
+
+from ..agents.forager import Forager, ForagerActions
+from ..agents.food import Food
+from ..agents.forager_config import ForagerConfig
+from .ensemble import Scenario
+from .simulation import Simulation
+from .target_queries import StepTargets
+
+MOTIVATIONS = ['nearest food', 'furthest food', 'most sustaining food',
+               'nearest forager', 'furthest forager', 'most compatible forager']
+
+# region World
+@dataclass(frozen=True)
+class World():
+    """
+    A synthetic square world for benchmarks. A share of the cells hold
+    foragers, food and hunters in the ratio 2:2:1.
+    """
+    size: int = 50
+    density: float = 0.05
+    num_ravines: int = 3
+    steps: int = 20
+
+    def scenario(self) -> Scenario:
+        """
+        The inhabitants of the world.
+        """
+        num_objects = max(5, round(self.size * self.size * self.density))
+        num_foragers = num_objects * 2 // 5
+        num_food = num_objects * 2 // 5
+        return Scenario(num_foragers=num_foragers,
+                        num_hunters=num_objects - num_foragers - num_food,
+                        num_ravines=self.num_ravines,
+                        num_food=num_food,
+                        grid_height=self.size,
+                        grid_width=self.size,
+                        steps=self.steps)
+
+def build_simulation(scenario: Scenario,
+                     seed: int,
+                     run_name: str = 'benchmark',
+                     forager_config: ForagerConfig = None,
+                     grid_backend: str = 'object',
+                     log_level: str = 'off') -> Simulation:
+    """
+    Creates a seeded simulation with every object placed, ready to run
+    or to call into. Destinations for the first step are resolved so
+    forager actions can be called outside `Simulation.run`.
+
+    Args:
+        scenario (Scenario): What to simulate.
+        seed (int): Seed for the random number generator.
+        run_name (str): Name of directory to store information.
+        forager_config (ForagerConfig): Configuration for the foragers.
+            Loaded from `forager_config.toml` if not given.
+        grid_backend (str): 'object' or 'array'.
+        log_level (str): How much is recorded in the event log.
+
+    Returns:
+        Simulation: The simulation, not yet run.
+    """
+    random.seed(seed)
+    simulation = Simulation(scenario.grid_width,
+                            scenario.grid_height,
+                            run_name,
+                            forager_config=forager_config,
+                            grid_backend=grid_backend,
+                            log_level=log_level,
+                            record_grid_history=log_level != 'off')
+    simulation.setup_environment(scenario.build_environment(simulation.forager_config))
+    simulation.step_targets = StepTargets(simulation.entity_index.locate(Forager),
+                                          simulation.entity_index.locate(Food))
+    return simulation
+
+# region Benchmarks
+# Each benchmark makes calls into a freshly built simulation of a world
+# and returns the number of calls made, or the number of calls and the
+# seconds they took when it has setup that should not be timed.
+def bench_hunter_next_move(simulation: Simulation, world: World) -> int:
+    for hunter in simulation.hunters:
+        hunter.get_next_move(simulation.grid, simulation.height, simulation.width)
+    return len(simulation.hunters)
+
+def bench_forager_actions_init(simulation: Simulation, world: World) -> int:
+    for forager in simulation.foragers:
+        ForagerActions(simulation, forager)
+    return len(simulation.foragers)
+
+def bench_set_motivation(simulation: Simulation, world: World) -> int:
+    for forager in simulation.foragers:
+        ForagerActions(simulation, forager).set_motivation()
+    return len(simulation.foragers)
+
+def bench_novelty_value(simulation: Simulation, world: World) -> int:
+    for forager in simulation.foragers:
+        actions = ForagerActions(simulation, forager)
+        for motivation in MOTIVATIONS:
+            actions.novelty_value(motivation)
+    return len(simulation.foragers) * len(MOTIVATIONS)
+
+def bench_destination_coordinates(simulation: Simulation, world: World) -> int:
+    for forager in simulation.foragers:
+        actions = ForagerActions(simulation, forager)
+        for motivation in MOTIVATIONS:
+            actions.get_destination_coordinates(motivation)
+    return len(simulation.foragers) * len(MOTIVATIONS)
+
+def bench_random_empty_cell(simulation: Simulation, world: World) -> int:
+    find_random_empty_cell = simulation._Simulation__find_random_empty_cell
+    num_calls = 1000
+    for _ in range(num_calls):
+        find_random_empty_cell()
+    return num_calls
+
+def bench_place_object(simulation: Simulation, world: World) -> tuple[int, float]:
+    # Fill a tenth of the empty cells
+    num_calls = max(1, len(simulation.free_cells) // 10)
+    foods = [Food() for _ in range(num_calls)]
+    place_object = simulation._Simulation__place_object
+    start = time.perf_counter()
+    for food in foods:
+        place_object(food)
+    # Creating the food is not timed
+    return num_calls, time.perf_counter() - start
+
+def bench_simulation_step(simulation: Simulation, world: World) -> int:
+    simulation.run(steps=world.steps, replace=False, display=False)
+    # Steps stop early if every forager is lost
+    return len(simulation.gene_trends['average agility'])
+
+BENCHMARKS = {
+    'hunter_next_move': bench_hunter_next_move,
+    'forager_actions_init': bench_forager_actions_init,
+    'set_motivation': bench_set_motivation,
+    'novelty_value': bench_novelty_value,
+    'destination_coordinates': bench_destination_coordinates,
+    'random_empty_cell': bench_random_empty_cell,
+    'place_object': bench_place_object,
+    'simulation_step': bench_simulation_step,
+}
+
+# region Runner
+def run_benchmark(name: str,
+                  world: World,
+                  seed: int = 0,
+                  repeats: int = 5,
+                  grid_backend: str = 'object') -> dict:
+    """
+    Times a benchmark in a world. The world is rebuilt from the same
+    seed before each repeat, and only the benchmark itself is timed.
+
+    Args:
+        name (str): Benchmark name, one of `BENCHMARKS`.
+        world (World): World to build.
+        seed (int): Seed for the random number generator.
+        repeats (int): Number of times to run the benchmark.
+        grid_backend (str): 'object' or 'array'.
+
+    Returns:
+        dict: Benchmark, world, number of calls, and the best, median and
+            mean seconds per call.
+    """
+    if name not in BENCHMARKS:
+        raise ValueError(f'Unknown benchmark: {name}. Choose from {list(BENCHMARKS)}.')
+    per_call = []
+    for _ in range(repeats):
+        simulation = build_simulation(world.scenario(), seed, grid_backend=grid_backend)
+        random.seed(seed + 1)
+        start = time.perf_counter()
+        result = BENCHMARKS[name](simulation, world)
+        elapsed = time.perf_counter() - start
+        if isinstance(result, tuple):
+            calls, elapsed = result
+        else:
+            calls = result
+        per_call.append(elapsed / max(calls, 1))
+    return {
+        'benchmark': name,
+        'world': asdict(world),
+        'grid_backend': grid_backend,
+        'calls': calls,
+        'repeats': repeats,
+        'best': min(per_call),
+        'median': statistics.median(per_call),
+        'mean': statistics.fmean(per_call),
+    }
+
+def run_suite(worlds: list[World],
+              names: list[str] = None,
+              seed: int = 0,
+              repeats: int = 5,
+              grid_backend: str = 'object',
+              output_path: str = None) -> dict:
+    """
+    Runs benchmarks in every world and optionally saves the results as
+    JSON.
+
+    Args:
+        worlds (list[World]): Worlds to benchmark.
+        names (list[str]): Benchmarks to run. Defaults to all of them.
+        seed (int): Seed for the random number generator.
+        repeats (int): Number of times to run each benchmark.
+        grid_backend (str): 'object' or 'array'.
+        output_path (str): JSON file to write.
+
+    Returns:
+        dict: The machine the suite ran on and a result per benchmark
+            and world.
+    """
+    if names is None:
+        names = list(BENCHMARKS)
+    results = [run_benchmark(name, world, seed, repeats, grid_backend)
+               for world in worlds for name in names]
+    suite = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'seed': seed,
+        'results': results,
+    }
+    if output_path is not None:
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(output_path, 'w') as f:
+            json.dump(suite, f, indent=2)
+    return suite
@@ -0,0 +1,121 @@
+import sys
+
+# Charts drawn by SimulationAnalytics, by file name
+CHARTS = [
+    'compare_decisions',
+    'simulation_metrics',
+    'gene_changes',
+    'motivations',
+    'lifetime_lengths',
+]
+
+def pyplot(show: bool = False):
+    """
+    Imports pyplot, with the non-interactive Agg backend unless charts
+    are shown. Matplotlib and seaborn are only imported when a chart is
+    first drawn.
+    """
+    import matplotlib
+    if not show and 'matplotlib.pyplot' not in sys.modules:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    sns.set_theme()
+    return plt
+
+def draw_chart(name: str,
+               data: dict,
+               directory: str,
+               formats: tuple[str, ...] = ('png',),
+               show: bool = False) -> str:
+    """
+    Draws a chart from its data, saves it in every format and closes it.
+    Only takes plain data so it can run in another process.
+
+    Args:
+        name (str): Chart name, one of `CHARTS`.
+        data (dict): Values to plot.
+        directory (str): Directory to save the chart in.
+        formats (tuple[str, ...]): File formats, such as 'png', or 'svg'
+            and 'pdf' for vector output.
+        show (bool): Show the chart in a window after saving it.
+
+    Returns:
+        str: The chart name.
+    """
+    plt = pyplot(show)
+    figure = DRAW_FUNCTIONS[name](plt, data)
+    for file_format in formats:
+        figure.savefig(f'{directory}/{name}.{file_format}')
+    if show:
+        plt.show()
+    plt.close(figure)
+    return name
+
+def draw_compare_decisions(plt, data: dict):
+    """
+    Bar chart displaying the number of novel decisions compared to
+    repeated decisions.
+    """
+    figure = plt.figure()
+    plt.bar(['Novel', 'Repeated'], [data['num_novel'], data['num_repeated']])
+    plt.title('Types of Decisions Made')
+    plt.xlabel('Decision')
+    plt.ylabel('No. of Decisions')
+    return figure
+
+def draw_simulation_metrics(plt, data: dict):
+    """
+    Bar chart of the final value of each simulation metric.
+    """
+    figure = plt.figure(figsize=(16, 6))
+    plt.bar(data['keys'], data['final_values'])
+    plt.title('Simulation Metrics')
+    plt.ylabel('Metric Value')
+    plt.xlabel('Metric')
+    return figure
+
+def draw_gene_changes(plt, data: dict):
+    """
+    Plots the average of each gene at every step.
+    """
+    figure = plt.figure()
+    for values in data['trends'].values():
+        plt.plot(range(data['num_steps']), values)
+    plt.title('Average Gene Trends')
+    plt.xlabel('Step')
+    plt.ylabel('Gene Value')
+    plt.legend(list(data['trends']))
+    return figure
+
+def draw_motivations(plt, data: dict):
+    """
+    Bar chart of how many times each motivation was chosen.
+    """
+    figure = plt.figure(figsize=(16, 6))
+    plt.bar(data['keys'], data['values'])
+    plt.title('Motivations Chosen')
+    plt.ylabel('No. of Times')
+    plt.xlabel('Motivation')
+    return figure
+
+def draw_lifetime_lengths(plt, data: dict):
+    """
+    Bar chart of the lifetime length of each forager.
+    """
+    figure = plt.figure()
+    life_lengths = data['life_lengths']
+    plt.title('Forager Lifetimes')
+    plt.xlabel('Forager Number')
+    plt.ylabel('Lifetime Length')
+    plt.bar(range(len(life_lengths)), life_lengths)
+    plt.xticks(range(len(life_lengths)), range(1, len(life_lengths) + 1))
+    return figure
+
+DRAW_FUNCTIONS = {
+    'compare_decisions': draw_compare_decisions,
+    'simulation_metrics': draw_simulation_metrics,
+    'gene_changes': draw_gene_changes,
+    'motivations': draw_motivations,
+    'lifetime_lengths': draw_lifetime_lengths,
+}
@@ -0,0 +1,211 @@
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+
+from ..agents.forager import Forager
+from ..agents.hunter import Hunter
+from ..agents.food import Food
+from ..agents.ravine import Ravine
+from ..agents.forager_config import ForagerConfig
+from .simulation import Simulation, GridFull, MoveError
+
+# Ravines are sized for the default grid, as in `novelty_search.py`, 
+# whatever the width of the simulation
+RAVINE_GRID_WIDTH = 15
+# Fewest cells a ravine covers
+MIN_RAVINE_CELLS = 4
+
+# region Scenario
+@dataclass(frozen=True)
+class Scenario():
+    """
+    The inhabitants, grid size and length of a simulation.
+    Mirrors the command line arguments of `novelty_search.py`.
+    """
+    num_foragers: int = 4
+    num_hunters: int = 3
+    num_ravines: int = 3
+    num_food: int = 6
+    grid_height: int = 15
+    grid_width: int = 15
+    steps: int = 75
+    replace: bool = False
+
+    def __post_init__(self) -> None:
+        """
+        Raises:
+            ValueError: A count or size is out of range, or the grid
+                cannot hold everything.
+        """
+        for name in ('num_foragers', 'num_food', 'grid_height', 'grid_width'):
+            if getattr(self, name) < 1:
+                raise ValueError(f'scenario: {name} must be at least 1. '
+                                 f'Current value: {getattr(self, name)}')
+        for name in ('num_hunters', 'num_ravines', 'steps'):
+            if getattr(self, name) < 0:
+                raise ValueError(f'scenario: {name} must be at least 0. '
+                                 f'Current value: {getattr(self, name)}')
+        min_side = RAVINE_GRID_WIDTH // 2
+        if self.num_ravines > 0 and min(self.grid_height, self.grid_width) < min_side:
+            raise ValueError(f'scenario: ravines need a grid of at least {min_side}x{min_side}. '
+                             f'Current size: {self.grid_width}x{self.grid_height}')
+        cells = (self.num_foragers + self.num_hunters + self.num_food 
+                 + self.num_ravines * MIN_RAVINE_CELLS)
+        if cells > self.grid_height * self.grid_width:
+            raise ValueError(f'scenario: {cells} cells are needed but the grid has '
+                             f'{self.grid_height * self.grid_width}.')
+
+    def build_environment(self, config: ForagerConfig) -> list:
+        """
+        Creates the objects to distribute in the simulation, in the
+        same order as the command line.
+
+        Args:
+            config (ForagerConfig): Configuration shared by the foragers.
+
+        Returns:
+            list: Ravines, foragers, hunters and food.
+        """
+        environment = []
+        for _ in range(self.num_ravines):
+            environment.append(Ravine(grid_width=RAVINE_GRID_WIDTH))
+        for i in range(self.num_foragers):
+            sex = 'M' if i % 2 == 0 else 'F'
+            environment.append(Forager(sex=sex, config=config))
+        for _ in range(self.num_hunters):
+            environment.append(Hunter())
+        for _ in range(self.num_food):
+            environment.append(Food())
+        return environment
+
+# region Replicates
+def run_replicate(scenario: Scenario,
+                  seed: int,
+                  run_name: str,
+                  forager_config: ForagerConfig = None,
+                  save_logs: bool = True,
+                  log_level: str = 'full',
+                  record_grid_history: bool = True) -> dict:
+    """
+    Runs one seeded simulation and summarises its results.
+    All output is written to `logs/<run_name>`.
+
+    Args:
+        scenario (Scenario): What to simulate.
+        seed (int): Seed for the random number generator.
+        run_name (str): Name of directory to store information.
+        forager_config (ForagerConfig): Configuration for the foragers.
+            Loaded from `forager_config.toml` if not given.
+        save_logs (bool): Save each foragers log.
+        log_level (str): How much is recorded in the event log. See
+            `LogLevel`.
+        record_grid_history (bool): Write the replay file.
+
+    Returns:
+        dict: Seed, run name, status, error, steps run, final simulation
+            metrics, gene trends and total motivations. A simulation
+            that ends early because the grid fills up or a move is
+            invalid is summarised up to that point, with status
+            'failed' and the error.
+    """
+    random.seed(seed)
+    simulation = Simulation(scenario.grid_width,
+                            scenario.grid_height,
+                            run_name,
+                            forager_config=forager_config,
+                            log_level=log_level,
+                            record_grid_history=record_grid_history)
+    error = None
+    try:
+        simulation.setup_environment(scenario.build_environment(simulation.forager_config))
+        simulation.run(steps=scenario.steps, replace=scenario.replace, display=True)
+    except (GridFull, MoveError) as e:
+        error = f'{type(e).__name__}: {str(e).strip()}'
+    if save_logs:
+        simulation.save_forager_logs(run_name=run_name)
+    return summarise(simulation, seed, error)
+
+def summarise(simulation: Simulation, seed: int = None, error: str = None) -> dict:
+    """
+    Gathers the results of a finished simulation.
+
+    Args:
+        simulation (Simulation): The simulation.
+        seed (int): Its seed.
+        error (str): Why the simulation ended early, if it did.
+
+    Returns:
+        dict: Seed, run name, status, error, steps run, final simulation
+            metrics, gene trends and total motivations.
+    """
+    return {
+        'seed': seed,
+        'run_name': simulation.run_name,
+        'status': 'ok' if error is None else 'failed',
+        'error': error,
+        'steps_run': len(simulation.gene_trends['average agility']),
+        # Final value of each metric in simulation_metrics
+        'simulation_metrics': {metric: getattr(simulation, metric)
+                               for metric in simulation.simulation_metrics},
+        'gene_trends': {gene: list(values)
+                        for gene, values in simulation.gene_trends.items()},
+        'total_motivations': dict(simulation.total_motivations),
+    }
+
+# region Ensemble
+def run_ensemble(scenario: Scenario,
+                 num_replicates: int,
+                 run_name: str,
+                 base_seed: int = 0,
+                 forager_config: ForagerConfig = None,
+                 max_workers: int = None) -> list[dict]:
+    """
+    Runs replicates of a scenario in parallel, one process per core.
+
+    Replicate i is seeded with `base_seed + i` and writes its output to
+    `logs/<run_name>/replicate_<i>`. The gathered results are saved to
+    `logs/<run_name>/summary.json`, with the seeds of any replicates that
+    failed. A failed replicate does not stop the others.
+
+    Args:
+        scenario (Scenario): What to simulate.
+        num_replicates (int): Number of simulations to run.
+        run_name (str): Name of directory to store information.
+        base_seed (int): Seed of the first replicate.
+        forager_config (ForagerConfig): Configuration for the foragers.
+            Loaded from `forager_config.toml` if not given.
+        max_workers (int): Number of processes. Defaults to the number
+            of cores.
+
+    Returns:
+        list[dict]: Summary of each replicate, in replicate order. A
+            replicate whose process failed has only its seed, run name,
+            status and error.
+    """
+    if forager_config is None:
+        forager_config = ForagerConfig.from_toml()
+    seeds = [base_seed + i for i in range(num_replicates)]
+    run_names = [f'{run_name}/replicate_{i}' for i in range(num_replicates)]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(run_replicate, scenario, seed, name, forager_config)
+                   for seed, name in zip(seeds, run_names)]
+        results = []
+        for seed, name, future in zip(seeds, run_names, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append({'seed': seed, 'run_name': name, 'status': 'failed',
+                                'error': f'{type(e).__name__}: {e}'})
+    failed_seeds = [result['seed'] for result in results if result['status'] != 'ok']
+
+    os.makedirs(f'logs/{run_name}', exist_ok=True)
+    with open(f'logs/{run_name}/summary.json', 'w') as f:
+        json.dump({
+            'scenario': asdict(scenario),
+            'forager_config': asdict(forager_config),
+            'failed_seeds': failed_seeds,
+            'replicates': results,
+        }, f, indent=2)
+    return results
@@ -0,0 +1,89 @@
+from bisect import bisect_left
+
+class EntityIndex():
+    """
+    Keeps track of where foragers, hunters and food are in the simulation
+    so they can be found without scanning the grid.
+
+    The simulation grid remains the source of truth; every write to the
+    grid is mirrored here by the simulation. Objects of each type are kept
+    in the order a row-by-row scan of the grid would find them, so the
+    index doubles as a world view shared by every forager.
+    """
+    def __init__(self, tracked_types: tuple) -> None:
+        # type -> (x,y) -> object
+        self.__cells = {object_class: {} for object_class in tracked_types}
+        # object -> (x,y)
+        self.__positions = {}
+        # type -> [(y,x)] and [(object, (x,y))], both in row-major order
+        self.__order_keys = {object_class: [] for object_class in tracked_types}
+        self.__located = {object_class: [] for object_class in tracked_types}
+
+    def is_tracked(self, obj) -> bool:
+        """
+        Checks if objects of this type are kept in the index.
+        """
+        return type(obj) in self.__cells
+
+    def add(self, obj, x: int, y: int) -> None:
+        """
+        Records an object occupying (x,y).
+
+        Args:
+            obj (Forager | Hunter | Food): Object placed in the grid.
+            x (int): x coordinate.
+            y (int): y coordinate.
+        """
+        object_class = type(obj)
+        self.__cells[object_class][(x, y)] = obj
+        self.__positions[obj] = (x, y)
+        keys = self.__order_keys[object_class]
+        i = bisect_left(keys, (y, x))
+        keys.insert(i, (y, x))
+        self.__located[object_class].insert(i, (obj, (x, y)))
+
+    def remove(self, obj, x: int, y: int) -> None:
+        """
+        Records an object no longer occupying (x,y).
+
+        Args:
+            obj (Forager | Hunter | Food): Object removed from the grid.
+            x (int): x coordinate.
+            y (int): y coordinate.
+        """
+        object_class = type(obj)
+        cells = self.__cells[object_class]
+        if cells.get((x, y)) is obj:
+            del cells[(x, y)]
+            keys = self.__order_keys[object_class]
+            i = bisect_left(keys, (y, x))
+            del keys[i]
+            del self.__located[object_class][i]
+        if self.__positions.get(obj) == (x, y):
+            del self.__positions[obj]
+
+    def position_of(self, obj) -> tuple[int, int] | None:
+        """
+        Gets the coordinates of an object.
+
+        Returns:
+            tuple(int, int) | None: (x,y) coordinates, or None if the
+                object is not in the grid.
+        """
+        return self.__positions.get(obj)
+
+    def locate(self, object_class) -> list:
+        """
+        Gets every object of a type alongside its coordinates.
+        Objects are ordered as a row-by-row scan of the grid would find them.
+
+        The list is shared and kept up to date as objects move, so it must
+        not be modified by the caller.
+
+        Args:
+            object_class (Food | Forager | Hunter): Object class.
+
+        Returns:
+            list: List of (object, (x,y)) pairs.
+        """
+        return self.__located[object_class]
@@ -0,0 +1,267 @@
+import json
+from enum import IntEnum
+
+from ..agents.gene_history import GENES
+from ..agents.entity_ids import id_alias
+
+class LogLevel(IntEnum):
+    """
+    How much of a simulation is recorded. Each level records everything
+    the levels below it do.
+
+    - OFF: nothing, and no event log file is written
+    - SUMMARY: the start and end of each step, lost and replaced foragers
+    - EVENTS: every forager action
+    - FULL: the grid at each step, and forager genes
+    """
+    OFF = 0
+    SUMMARY = 1
+    EVENTS = 2
+    FULL = 3
+
+# Event types. Every event is a tuple of (type, step, ...) and is written
+# to the event log as one JSON array per line. IDs are integers, shown as
+# their aliases in text logs.
+# (STEP, step)
+STEP = 'step'
+# (FRAME, step, rows): the grid, one string per row
+FRAME = 'frame'
+# (LOST, step): every forager has been lost
+LOST = 'lost'
+# (TURN, step, forager_num, forager_id, genes, markers): genes and their
+# change markers are None unless displayed
+TURN = 'turn'
+# (STEP_END, step, is_last_step)
+STEP_END = 'step end'
+# (SPAWN, step, forager_id): a forager replaces one that was lost
+SPAWN = 'spawn'
+# (MOVE, step, forager_id, (from_x, from_y), (to_x, to_y))
+MOVE = 'move'
+# (MOTIVATION, step, forager_id, motivation)
+MOTIVATION = 'motivation'
+# (FOUND, step, forager_id, motivation)
+FOUND = 'found'
+# (EAT, step, forager_id, food_name, sustenance_granted)
+EAT = 'eat'
+# (STARVE, step, forager_id)
+STARVE = 'starve'
+# (RAVINE, step, forager_id, crossed)
+RAVINE = 'ravine'
+# (MATE, step, forager_id, sex, compatibility, partner_id, partner_sex,
+#  partner_compatibility, compatible)
+MATE = 'mate'
+# (OFFSPRING, step, forager_id, partner_id, offspring_id)
+OFFSPRING = 'offspring'
+# (FIGHT, step, forager_id, hunter_id, won)
+FIGHT = 'fight'
+# (FLEE, step, forager_id, hunter_id, escaped)
+FLEE = 'flee'
+
+# Events that are written to the foragers log
+FORAGER_ACTIONS = frozenset((MOTIVATION, FOUND, EAT, STARVE, RAVINE, MATE, 
+                             OFFSPRING, FIGHT, FLEE))
+
+# region Writer
+class EventLog():
+    """
+    Buffered writer for simulation events.
+
+    Events are held in memory and written in batches of `buffer_size`
+    as line-delimited JSON. Nothing is written while the log is closed.
+    """
+    def __init__(self, buffer_size: int = 4096) -> None:
+        self.buffer_size = buffer_size
+        self.path = None
+        self.__buffer = []
+        self.__file = None
+
+    def open(self, path: str) -> None:
+        """
+        Starts writing events to a new file.
+        """
+        self.close()
+        self.path = path
+        self.__file = open(path, 'w')
+
+    def emit(self, *event) -> None:
+        """
+        Records an event.
+        """
+        if self.__file is None:
+            return
+        self.__buffer.append(event)
+        if len(self.__buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes buffered events to file.
+        """
+        if self.__file is None or not self.__buffer:
+            return
+        dumps = json.JSONEncoder(separators=(',', ':')).encode
+        self.__file.write('\n'.join([dumps(event) for event in self.__buffer]))
+        self.__file.write('\n')
+        self.__buffer.clear()
+        self.__file.flush()
+
+    def close(self) -> None:
+        """
+        Writes any buffered events and closes the file.
+        """
+        if self.__file is None:
+            return
+        self.flush()
+        self.__file.close()
+        self.__file = None
+
+    def __getstate__(self) -> dict:
+        """
+        Saved in a checkpoint as the path and length of the file written
+        so far. Buffered events are written first.
+        """
+        self.flush()
+        return {
+            'buffer_size': self.buffer_size,
+            'path': self.path,
+            'position': None if self.__file is None else self.__file.tell(),
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restored from a checkpoint by reopening the file and discarding
+        anything written after the checkpoint.
+        """
+        self.buffer_size = state['buffer_size']
+        self.path = state['path']
+        self.__buffer = []
+        self.__file = None
+        if state['position'] is not None:
+            self.__file = open(self.path, 'r+')
+            self.__file.truncate(state['position'])
+            self.__file.seek(state['position'])
+
+    def __enter__(self) -> 'EventLog':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+def read_events(path: str):
+    """
+    Reads the events in an event log file, in order.
+    """
+    with open(path) as f:
+        for line in f:
+            yield json.loads(line)
+
+# region Text
+def render_event(event) -> str | None:
+    """
+    Describes a forager event in a sentence, as written to the foragers
+    log. Returns None for events that are not forager actions. IDs are
+    written as their short aliases.
+    """
+    kind, step = event[0], event[1]
+    if kind not in FORAGER_ACTIONS:
+        return None
+    forager = id_alias(event[2])
+    if kind == MOTIVATION:
+        return f'Step {step}: Forager {forager} is going to find {event[3]}.'
+    if kind == FOUND:
+        return f'Step {step}: Forager {forager} found {event[3]}.'
+    if kind == EAT:
+        return f'Step {step}: {forager} ate the {event[3]}.'
+    if kind == STARVE:
+        return f'Step {step}: {forager} starved.'
+    if kind == RAVINE:
+        if event[3]:
+            return f'Step {step}: {forager} successfully crossed ravine.'
+        return f'Step {step}: {forager} fails to cross ravine.'
+    if kind == MATE:
+        _, _, _, sex, compatibility, partner_id, partner_sex, partner_compatibility, compatible = event
+        partner = id_alias(partner_id)
+        if compatible:
+            return (f'Step {step}: {forager} ({sex}: {compatibility:.2f}) '
+                    f'and {partner} ({partner_sex}: {partner_compatibility:.2f}) are compatible.')
+        if sex == partner_sex:
+            return (f'Step {step}: {forager} ({sex}) and {partner} '
+                    f'({partner_sex}) are not compatible.')
+        return (f'Step {step}: {forager} ({compatibility:.2f}) '
+                f'and {partner} ({partner_compatibility:.2f}) '
+                'are not compatible.')
+    if kind == OFFSPRING:
+        return (f'Step {step}: {forager} and {id_alias(event[3])} '
+                f'produced offspring {id_alias(event[4])}.')
+    if kind == FIGHT:
+        if event[4]:
+            return f'Step {step}: {forager} beat hunter {id_alias(event[3])}.'
+        return f'Step {step}: {forager} lost to hunter {id_alias(event[3])}.'
+    if event[4]:
+        return f'Step {step}: {forager} fled hunter {id_alias(event[3])}.'
+    return f'Step {step}: {forager} was caught by hunter {id_alias(event[3])}.'
+
+class TextRenderer():
+    """
+    Renders a stream of events as the human-readable simulation log.
+    """
+    def render(self, event) -> list[str]:
+        """
+        Gets the lines of text for an event.
+        """
+        kind = event[0]
+        if kind == STEP:
+            return ['*' + '*' * 52 + '*', f"{'Step'} {event[1]:<45}\n"]
+        if kind == FRAME:
+            return list(event[2])
+        if kind == LOST:
+            return ['All foragers have been lost!']
+        if kind == TURN:
+            _, _, forager_num, forager_id, genes, markers = event
+            if genes is None:
+                return ['']
+            return self.__gene_table(forager_num, forager_id, genes, markers) + ['']
+        if kind == STEP_END:
+            return ['*' + '-' * 52 + '*'] if event[2] else ['*' + '-' * 52 + '*', '']
+        if kind == SPAWN:
+            return [f'adding new forager {id_alias(event[2])}']
+        statement = render_event(event)
+        return [] if statement is None else [statement]
+
+    def __gene_table(self, 
+                     forager_num: int, 
+                     forager_id: int, 
+                     genes: list, 
+                     markers: list) -> list[str]:
+        """
+        Table of a foragers genes and coordinates. Genes that changed
+        since its previous turn are marked with '+' or '-'.
+        """
+        lines = ['',
+                 '*' + '-' * 24 + '*',
+                 f'| Forager {forager_num + 1:<4}| {id_alias(forager_id):<9}|',
+                 '*' + '-' * 24 + '*']
+        values, coords = genes[:-1], genes[-1]
+        for name, value, icon in zip(GENES, values, markers):
+            lines.append(f'| {name.title():<12}| {value:>6.2f} {icon:<1} |')
+            if name == 'endurance':
+                label = '(x,y)'
+                x, y = coords
+                lines.append(f"| {label:<12}| {'('+f'{x:<2}'}, {f'{y:>2}' + ')'} |")
+        lines.append('*' + '-' * 24 + '*')
+        return lines
+
+def render_text(events_path: str, text_path: str) -> None:
+    """
+    Writes an event log as the human-readable simulation log.
+
+    Args:
+        events_path (str): Event log file.
+        text_path (str): Text file to write.
+    """
+    renderer = TextRenderer()
+    with open(text_path, 'w') as f:
+        for event in read_events(events_path):
+            for line in renderer.render(event):
+                f.write(line)
+                f.write('\n')
@@ -0,0 +1,45 @@
+import random
+
+class FreeCells():
+    """
+    The empty cells of the simulation, kept up to date as cells are
+    occupied and vacated so a random empty cell can be found without
+    scanning the grid.
+
+    Cells are stored in a list for constant time random choice, alongside
+    a map of each cell to its position in the list for constant time
+    removal.
+    """
+    def __init__(self, width: int, height: int) -> None:
+        self.__cells = [(x, y) for y in range(height) for x in range(width)]
+        self.__positions = {cell: i for i, cell in enumerate(self.__cells)}
+
+    def occupy(self, x: int, y: int) -> None:
+        """
+        Removes (x,y) from the empty cells.
+        The last cell in the list takes its place.
+        """
+        i = self.__positions.pop((x, y))
+        last = self.__cells.pop()
+        if i < len(self.__cells):
+            self.__cells[i] = last
+            self.__positions[last] = i
+
+    def vacate(self, x: int, y: int) -> None:
+        """
+        Adds (x,y) to the empty cells.
+        """
+        self.__positions[(x, y)] = len(self.__cells)
+        self.__cells.append((x, y))
+
+    def random_cell(self) -> tuple[int, int]:
+        """
+        Picks an empty cell at random.
+
+        Returns:
+            tuple(int, int): (x,y) coordinates.
+        """
+        return random.choice(self.__cells)
+
+    def __len__(self) -> int:
+        return len(self.__cells)
@@ -0,0 +1,166 @@
+import numpy as np
+
+from ..agents.forager import Forager
+from ..agents.hunter import Hunter
+from ..agents.food import Food
+from ..agents.ravine import Ravine
+
+# Integer codes for the type of object in each cell
+EMPTY = 0
+FORAGER = 1
+HUNTER = 2
+FOOD = 3
+RAVINE = 4
+
+TYPE_CODES = {
+    Forager: FORAGER,
+    Hunter: HUNTER,
+    Food: FOOD,
+    Ravine: RAVINE
+}
+
+# Characters used to display each type of object
+SYMBOLS = {
+    EMPTY: '.',
+    FORAGER: 'F',
+    HUNTER: 'H',
+    FOOD: '*',
+    RAVINE: 'R'
+}
+
+# region Object Grid
+class ObjectGrid():
+    """
+    The simulation grid stored as rows of objects.
+    """
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.cells = [[None for _ in range(width)] for _ in range(height)]
+
+    def get(self, x: int, y: int) -> Forager | Hunter | Food | Ravine | None:
+        """
+        Gets the object at (x,y).
+        """
+        return self.cells[y][x]
+
+    def set(self, x: int, y: int, obj: Forager | Hunter | Food | Ravine | None) -> None:
+        """
+        Puts an object, or None, at (x,y).
+        """
+        self.cells[y][x] = obj
+
+    def is_empty(self, x: int, y: int) -> bool:
+        """
+        Checks if nothing is at (x,y).
+        """
+        return self.cells[y][x] is None
+
+    def type_codes(self) -> np.ndarray:
+        """
+        Gets the type code of every cell as a (height, width) array.
+        """
+        return np.array([[TYPE_CODES.get(type(cell), EMPTY) for cell in row]
+                         for row in self.cells], dtype=np.int8).reshape(self.height, self.width)
+
+    def render(self) -> list[str]:
+        """
+        Gets each row of the grid as a line of characters.
+        """
+        return [' '.join([SYMBOLS[TYPE_CODES.get(type(cell), EMPTY)] for cell in row])
+                for row in self.cells]
+
+# region Array Grid
+class ArrayGrid():
+    """
+    The simulation grid stored as NumPy arrays.
+
+    `types` holds the type code of each cell and `handles` holds a handle
+    for the object in each cell, or -1 if the cell is empty. Objects are
+    looked up from their handle in a side table. A handle is released
+    once its object no longer occupies any cell.
+    """
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.types = np.zeros((height, width), dtype=np.int8)
+        self.handles = np.full((height, width), -1, dtype=np.int32)
+        # Side tables indexed by handle
+        self.objects = []
+        self.cell_counts = []
+        # object -> handle
+        self.__handle_of = {}
+        self.__free_handles = []
+        self.__symbols = np.array([SYMBOLS[code] for code in sorted(SYMBOLS)])
+
+    def get(self, x: int, y: int) -> Forager | Hunter | Food | Ravine | None:
+        """
+        Gets the object at (x,y).
+        """
+        handle = self.handles[y, x]
+        return None if handle < 0 else self.objects[handle]
+
+    def set(self, x: int, y: int, obj: Forager | Hunter | Food | Ravine | None) -> None:
+        """
+        Puts an object, or None, at (x,y).
+        """
+        previous = self.handles[y, x]
+        if previous >= 0:
+            self.__release(int(previous))
+        if obj is None:
+            self.types[y, x] = EMPTY
+            self.handles[y, x] = -1
+        else:
+            self.types[y, x] = TYPE_CODES[type(obj)]
+            self.handles[y, x] = self.__acquire(obj)
+
+    def is_empty(self, x: int, y: int) -> bool:
+        """
+        Checks if nothing is at (x,y).
+        """
+        return self.types[y, x] == EMPTY
+
+    def type_codes(self) -> np.ndarray:
+        """
+        Gets the type code of every cell as a (height, width) array.
+        """
+        return self.types.copy()
+
+    def render(self) -> list[str]:
+        """
+        Gets each row of the grid as a line of characters.
+        """
+        return [' '.join(row) for row in self.__symbols[self.types].tolist()]
+
+    def __acquire(self, obj) -> int:
+        """
+        Gets the handle of an object, creating one if it is not in the grid.
+        """
+        handle = self.__handle_of.get(obj)
+        if handle is None:
+            if len(self.__free_handles) > 0:
+                handle = self.__free_handles.pop()
+                self.objects[handle] = obj
+                self.cell_counts[handle] = 0
+            else:
+                handle = len(self.objects)
+                self.objects.append(obj)
+                self.cell_counts.append(0)
+            self.__handle_of[obj] = handle
+        self.cell_counts[handle] += 1
+        return handle
+
+    def __release(self, handle: int) -> None:
+        """
+        Frees a handle once its object no longer occupies any cell.
+        """
+        self.cell_counts[handle] -= 1
+        if self.cell_counts[handle] == 0:
+            del self.__handle_of[self.objects[handle]]
+            self.objects[handle] = None
+            self.__free_handles.append(handle)
+
+GRID_BACKENDS = {
+    'object': ObjectGrid,
+    'array': ArrayGrid
+}
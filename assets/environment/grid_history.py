@@ -0,0 +1,218 @@
+import struct
+import zlib
+
+import numpy as np
+
+from .grid import EMPTY, SYMBOLS, TYPE_CODES
+
+# File layout
+#   header: magic, version, width, height, keyframe interval
+#   frames: kind, step, count, compressed size, then either every
+#           cell's type code (keyframe) or `count` changed cells (delta),
+#           compressed with zlib
+#   footer: offset, step and kind of every frame, then the number of
+#           frames and an end marker
+MAGIC = b'NSGH'
+END_MAGIC = b'NSGE'
+VERSION = 2
+HEADER = struct.Struct('<4sHHHH')
+FRAME_HEADER = struct.Struct('<BiII')
+FOOTER_END = struct.Struct('<Q4s')
+
+KEYFRAME = 0
+DELTA = 1
+
+CHANGE_DTYPE = np.dtype([('x', '<u2'), ('y', '<u2'), ('code', 'i1')])
+COMPRESSION_LEVEL = 6
+
+# region Writer
+class GridHistoryWriter():
+    """
+    Records the grid at the start of every step as a replay file.
+
+    Every `keyframe_interval` steps the type code of every cell is
+    written. In between only the cells that changed since the previous
+    step are written. Each frame is compressed on its own so any frame
+    can still be read by seeking to it. Changes are collected as the
+    simulation writes to the grid, so the grid is never scanned after
+    the first frame.
+    """
+    def __init__(self, path: str, grid, keyframe_interval: int = 25) -> None:
+        """
+        Args:
+            path (str): File to write.
+            grid (ObjectGrid | ArrayGrid): The simulation grid.
+            keyframe_interval (int): Steps between keyframes.
+        """
+        self.grid = grid
+        self.keyframe_interval = keyframe_interval
+        self.path = path
+        self.__file = open(path, 'wb')
+        self.__file.write(HEADER.pack(MAGIC, VERSION, grid.width, grid.height,
+                                      keyframe_interval))
+        # Type codes as of the last frame written
+        self.__codes = grid.type_codes()
+        self.__changed = set()
+        self.__offsets = []
+        self.__steps = []
+        self.__kinds = []
+        self.__last_step = -1
+
+    def mark(self, x: int, y: int) -> None:
+        """
+        Notes that the object at (x,y) has been replaced.
+        """
+        self.__changed.add((x, y))
+
+    def write_frame(self, step: int) -> None:
+        """
+        Writes the grid as it is at the start of a step.
+        """
+        changes = self.__apply_changes()
+        if step % self.keyframe_interval == 0 or not self.__offsets:
+            payload = self.__codes.tobytes()
+            self.__write(KEYFRAME, step, self.__codes.size, payload)
+        else:
+            self.__write(DELTA, step, len(changes), changes.tobytes())
+        self.__last_step = step
+
+    def close(self) -> None:
+        """
+        Writes the final state of the grid, then the index of frames.
+        """
+        if self.__file is None:
+            return
+        if self.__offsets:
+            changes = self.__apply_changes()
+            self.__write(DELTA, self.__last_step + 1, len(changes), changes.tobytes())
+        self.__file.write(np.array(self.__offsets, dtype='<i8').tobytes())
+        self.__file.write(np.array(self.__steps, dtype='<i4').tobytes())
+        self.__file.write(np.array(self.__kinds, dtype='u1').tobytes())
+        self.__file.write(FOOTER_END.pack(len(self.__offsets), END_MAGIC))
+        self.__file.close()
+        self.__file = None
+
+    def flush(self) -> None:
+        """
+        Writes frames held by the file buffer to disk.
+        """
+        if self.__file is not None:
+            self.__file.flush()
+
+    def __getstate__(self) -> dict:
+        """
+        Saved in a checkpoint without the open file, which is replaced by
+        the length written so far.
+        """
+        self.flush()
+        state = self.__dict__.copy()
+        file = state.pop('_GridHistoryWriter__file')
+        state['position'] = None if file is None else file.tell()
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restored from a checkpoint by reopening the file and discarding
+        anything written after the checkpoint.
+        """
+        position = state.pop('position')
+        self.__dict__.update(state)
+        self.__file = None
+        if position is not None:
+            self.__file = open(self.path, 'r+b')
+            self.__file.truncate(position)
+            self.__file.seek(position)
+
+    def __apply_changes(self) -> np.ndarray:
+        """
+        Updates the stored type codes with the cells that changed and
+        returns those that differ from the last frame.
+        """
+        changes = []
+        # Sorted so the file does not depend on the order of the set
+        for x, y in sorted(self.__changed):
+            code = TYPE_CODES.get(type(self.grid.get(x, y)), EMPTY)
+            if self.__codes[y, x] != code:
+                self.__codes[y, x] = code
+                changes.append((x, y, code))
+        self.__changed.clear()
+        return np.array(changes, dtype=CHANGE_DTYPE)
+
+    def __write(self, kind: int, step: int, count: int, payload: bytes) -> None:
+        compressed = zlib.compress(payload, COMPRESSION_LEVEL)
+        self.__offsets.append(self.__file.tell())
+        self.__steps.append(step)
+        self.__kinds.append(kind)
+        self.__file.write(FRAME_HEADER.pack(kind, step, count, len(compressed)))
+        self.__file.write(compressed)
+
+# region Reader
+class GridHistoryReader():
+    """
+    Reads a replay file. Any step can be read directly: the reader
+    seeks to the nearest keyframe before it and applies the deltas
+    that follow.
+    """
+    def __init__(self, path: str) -> None:
+        self.__file = open(path, 'rb')
+        magic, version, self.width, self.height, self.keyframe_interval = \
+            HEADER.unpack(self.__file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path} is not a grid history file.')
+        self.__file.seek(-FOOTER_END.size, 2)
+        num_frames, end_magic = FOOTER_END.unpack(self.__file.read(FOOTER_END.size))
+        if end_magic != END_MAGIC:
+            raise ValueError(f'{path} is incomplete.')
+        self.__file.seek(-FOOTER_END.size - num_frames * 13, 2)
+        index = self.__file.read(num_frames * 13)
+        self.__offsets = np.frombuffer(index, dtype='<i8', count=num_frames)
+        self.steps = np.frombuffer(index, dtype='<i4', count=num_frames,
+                                   offset=num_frames * 8)
+        self.__kinds = np.frombuffer(index, dtype='u1', count=num_frames,
+                                     offset=num_frames * 12)
+
+    def frame(self, step: int) -> np.ndarray:
+        """
+        Gets the type code of every cell at the start of a step.
+
+        Returns:
+            np.ndarray: (height, width) array of type codes.
+        """
+        i = int(np.searchsorted(self.steps, step, side='right')) - 1
+        if i < 0 or self.steps[i] != step:
+            raise KeyError(f'Step {step} is not in the grid history.')
+        keyframes = np.flatnonzero(self.__kinds[:i + 1] == KEYFRAME)
+        codes = None
+        for j in range(keyframes[-1], i + 1):
+            kind, count, payload = self.__read(j)
+            if kind == KEYFRAME:
+                codes = np.frombuffer(payload, dtype=np.int8).reshape(self.height, self.width).copy()
+            else:
+                changes = np.frombuffer(payload, dtype=CHANGE_DTYPE, count=count)
+                codes[changes['y'], changes['x']] = changes['code']
+        return codes
+
+    def render(self, step: int) -> list[str]:
+        """
+        Gets each row of the grid at the start of a step as a line of
+        characters.
+        """
+        symbols = np.array([SYMBOLS[code] for code in sorted(SYMBOLS)])
+        return [' '.join(row) for row in symbols[self.frame(step)].tolist()]
+
+    def close(self) -> None:
+        self.__file.close()
+
+    def __enter__(self) -> 'GridHistoryReader':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __read(self, i: int) -> tuple[int, int, bytes]:
+        """
+        Reads the frame at position i in the index.
+        """
+        self.__file.seek(int(self.__offsets[i]))
+        kind, _, count, size = FRAME_HEADER.unpack(self.__file.read(FRAME_HEADER.size))
+        return kind, count, zlib.decompress(self.__file.read(size))
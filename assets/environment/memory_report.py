@@ -0,0 +1,198 @@
+import sys
+import tracemalloc
+from collections import deque
+
+import numpy as np
+
+from ..agents.forager import Forager
+from ..agents.hunter import Hunter
+from ..agents.food import Food
+from ..agents.ravine import Ravine
+from .event_log import EventLog
+
+ENTITY_TYPES = (Forager, Hunter, Food, Ravine)
+
+# Allocations made by the profiler and the import system are not reported
+IGNORED_TRACES = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+# region Sizes
+def deep_size(value, seen: set) -> int:
+    """
+    Bytes used by a value and the containers, strings and numbers inside
+    it. Other objects, such as agents or stores, are owned elsewhere and
+    are not counted. Anything in `seen` has already been counted.
+    """
+    if id(value) in seen:
+        return 0
+    if isinstance(value, np.ndarray):
+        seen.add(id(value))
+        return sys.getsizeof(value) if value.base is None else value.nbytes
+    if isinstance(value, dict):
+        seen.add(id(value))
+        return sys.getsizeof(value) + sum(deep_size(k, seen) + deep_size(v, seen)
+                                          for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset, deque)):
+        seen.add(id(value))
+        return sys.getsizeof(value) + sum(deep_size(item, seen) for item in value)
+    if isinstance(value, (str, bytes, int, float, bool, np.generic)):
+        seen.add(id(value))
+        return sys.getsizeof(value)
+    return 0
+
+def attribute_sizes(obj, seen: set) -> dict:
+    """
+    Bytes used by each attribute of an object, including those in
+    `__slots__`.
+    """
+    names = list(getattr(obj, '__dict__', {}))
+    for cls in type(obj).__mro__:
+        names += [name for name in getattr(cls, '__slots__', ()) if name not in names]
+    return {name: deep_size(getattr(obj, name), seen)
+            for name in names if hasattr(obj, name)}
+
+def object_size(obj, seen: set) -> int:
+    """
+    Bytes used by an object and its attributes.
+    """
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    return sys.getsizeof(obj) + sum(attribute_sizes(obj, seen).values())
+
+# region Report
+class MemoryReport():
+    """
+    Takes tracemalloc snapshots while a simulation runs and reports what
+    is using memory, streamed as one `["memory", step, report]` JSON line
+    per snapshot.
+
+    Each line holds the memory traced and its growth per step since the
+    last snapshot, bytes used by each entity type and its attributes,
+    bytes used by the simulation's shared structures, and the source lines
+    that allocated the most memory and grew the most.
+    """
+    def __init__(self, every_n_steps: int = 10, top: int = 10) -> None:
+        """
+        Args:
+            every_n_steps (int): Steps between snapshots.
+            top (int): Number of allocation sites to report.
+        """
+        if every_n_steps < 1:
+            raise ValueError('Memory snapshots must be at least 1 step apart.')
+        self.every_n_steps = every_n_steps
+        self.top = top
+        self.reports = []
+        # Report file, open while running
+        self.stream = EventLog(buffer_size=1)
+        self.__previous = None
+        self.__previous_step = None
+        self.__previous_traced = None
+
+    def snapshot(self, step: int, simulation) -> dict:
+        """
+        Reports on the memory used at a step. tracemalloc must be tracing.
+
+        Args:
+            step (int): The step.
+            simulation (Simulation): The simulation.
+
+        Returns:
+            dict: The report, which is also kept in `reports` and streamed.
+        """
+        traced, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(IGNORED_TRACES)
+        growth = None
+        if self.__previous_step is not None and step > self.__previous_step:
+            growth = (traced - self.__previous_traced) / (step - self.__previous_step)
+
+        report = {
+            'step': step,
+            'traced_bytes': traced,
+            'peak_bytes': peak,
+            'growth_per_step': growth,
+            'entities': self.__entity_sizes(simulation),
+            'structures': self.__structure_sizes(simulation),
+            'top_sites': [{'site': f'{stat.traceback[0].filename}:{stat.traceback[0].lineno}',
+                           'bytes': stat.size,
+                           'count': stat.count}
+                          for stat in snapshot.statistics('lineno')[:self.top]],
+            'top_growth': [],
+        }
+        if self.__previous is not None:
+            report['top_growth'] = [
+                {'site': f'{stat.traceback[0].filename}:{stat.traceback[0].lineno}',
+                 'bytes': stat.size_diff,
+                 'count': stat.count_diff}
+                for stat in snapshot.compare_to(self.__previous, 'lineno')[:self.top]
+            ]
+        self.__previous = snapshot
+        self.__previous_step = step
+        self.__previous_traced = traced
+        self.reports.append(report)
+        self.stream.emit('memory', step, report)
+        return report
+
+    def __entity_sizes(self, simulation) -> dict:
+        """
+        Bytes used by the foragers, hunters, food and ravines in the grid,
+        and by foragers and hunters that have left it but are still held
+        by the simulation.
+        """
+        entities = {}
+        for y in range(simulation.height):
+            for x in range(simulation.width):
+                obj = simulation.grid.get(x, y)
+                if obj is not None:
+                    entities[id(obj)] = obj
+        for obj in simulation.foragers + simulation.hunters:
+            entities[id(obj)] = obj
+
+        sizes = {cls.__name__: {'count': 0, 'bytes': 0, 'attributes': {}}
+                 for cls in ENTITY_TYPES}
+        seen = set()
+        for obj in entities.values():
+            entry = sizes.get(type(obj).__name__)
+            if entry is None:
+                continue
+            seen.add(id(obj))
+            attributes = attribute_sizes(obj, seen)
+            entry['count'] += 1
+            entry['bytes'] += sys.getsizeof(obj) + sum(attributes.values())
+            for name, size in attributes.items():
+                entry['attributes'][name] = entry['attributes'].get(name, 0) + size
+        for entry in sizes.values():
+            entry['attributes'] = dict(sorted(entry['attributes'].items(),
+                                              key=lambda item: -item[1]))
+        return sizes
+
+    def __structure_sizes(self, simulation) -> dict:
+        """
+        Bytes used by structures shared by the whole simulation.
+        """
+        seen = set()
+        return {
+            'grid': object_size(simulation.grid, seen),
+            'entity index': object_size(simulation.entity_index, seen),
+            'free cells': object_size(simulation.free_cells, seen),
+            'population store': object_size(simulation.population, seen),
+            'gene history': object_size(simulation.population.history, seen),
+            'foragers list': deep_size(simulation.foragers, seen),
+            'simulation metrics': deep_size(simulation.simulation_metrics, seen),
+            'gene trends': deep_size(simulation.gene_trends, seen),
+        }
+
+    def __getstate__(self) -> dict:
+        """
+        Saved in a checkpoint without the last snapshot, so growth is
+        reported again from the first snapshot after resuming.
+        """
+        state = self.__dict__.copy()
+        state['_MemoryReport__previous'] = None
+        state['_MemoryReport__previous_step'] = None
+        state['_MemoryReport__previous_traced'] = None
+        return state
@@ -0,0 +1,252 @@
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+
+from .simulation import Simulation
+
+# Functions that start a phase of a simulation step, by file and name.
+# Phases match `RunMetrics`. The innermost phase on a stack is the one
+# it is attributed to, so placement inside an encounter is placement.
+PHASE_FUNCTIONS = {
+    ('simulation.py', 'checkpoint'): 'logging',
+    ('grid_history.py', 'write_frame'): 'logging',
+    ('grid.py', 'render'): 'logging',
+    ('forager.py', 'log_genes'): 'logging',
+    ('simulation.py', '__gather_gene_trend_data'): 'gene trends',
+    ('hunter.py', 'get_next_move'): 'hunters',
+    ('target_queries.py', '__init__'): 'targets',
+    ('population.py', 'retire'): 'targets',
+    ('forager.py', 'get_next_step'): 'decisions',
+    ('simulation.py', '__forager_finds_food'): 'encounters',
+    ('simulation.py', '__forager_finds_hunter'): 'encounters',
+    ('simulation.py', '__forager_finds_ravine'): 'encounters',
+    ('simulation.py', '__forager_finds_forager'): 'encounters',
+    ('simulation.py', '__forager_starves'): 'encounters',
+    ('simulation.py', '__forager_step'): 'encounters',
+    ('simulation.py', '__place_object'): 'placement',
+}
+
+# Agent type that owns the code in each module
+AGENT_FILES = {
+    'forager.py': 'Forager',
+    'forager_config.py': 'Forager',
+    'population.py': 'Forager',
+    'gene_history.py': 'Forager',
+    'hunter.py': 'Hunter',
+    'mammal.py': 'Mammal',
+    'food.py': 'Food',
+    'ravine.py': 'Ravine',
+}
+
+PROFILE_MODES = ['deterministic', 'sampling']
+
+# region Labels
+def frame_label(filename: str, lineno: int, funcname: str) -> str:
+    """
+    Names a function in a collapsed stack, e.g. `get_next_step (forager.py:199)`.
+    Built-in functions have no file.
+    """
+    if filename == '~' or not lineno:
+        return funcname
+    return f'{funcname} ({os.path.basename(filename)}:{lineno})'
+
+def label_source(label: str) -> tuple[str, str]:
+    """
+    The file and function name of a label made by `frame_label`.
+    """
+    if not label.endswith(')') or ' (' not in label:
+        return '', label
+    funcname, location = label[:-1].rsplit(' (', 1)
+    return location.rsplit(':', 1)[0], funcname
+
+# region Sampling
+class StackSampler():
+    """
+    Samples the Python stack of a thread at a fixed interval from a
+    background thread. Much cheaper than a deterministic profiler and
+    records whole stacks, but short calls may be missed.
+    """
+    def __init__(self, interval: float = 0.005) -> None:
+        """
+        Args:
+            interval (float): Seconds between samples.
+        """
+        self.interval = interval
+        self.stacks = {}
+        self.num_samples = 0
+        self.__thread = None
+        self.__stop = threading.Event()
+        self.__target = None
+
+    def start(self) -> None:
+        """
+        Starts sampling the calling thread.
+        """
+        self.__target = threading.get_ident()
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__sample, daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> None:
+        self.__stop.set()
+        self.__thread.join()
+
+    def __sample(self) -> None:
+        while not self.__stop.wait(self.interval):
+            frame = sys._current_frames().get(self.__target)
+            labels = []
+            while frame is not None:
+                code = frame.f_code
+                labels.append(frame_label(code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            stack = tuple(reversed(labels))
+            self.stacks[stack] = self.stacks.get(stack, 0) + 1
+            self.num_samples += 1
+
+# region Deterministic
+def collapse_pstats(stats: pstats.Stats, min_seconds: float = 1e-6) -> dict:
+    """
+    Rebuilds stacks from the caller graph of a deterministic profile.
+    cProfile only records which function called which, so the time of a
+    function is split between its callers in proportion to the time
+    each spent calling it.
+
+    Args:
+        stats (pstats.Stats): A loaded profile.
+        min_seconds (float): Branches taking less time are dropped.
+
+    Returns:
+        dict: Stack (tuple of labels, outermost first) -> seconds spent in
+            the innermost function itself.
+    """
+    entries = stats.stats
+    children = {}
+    for function, (_, _, _, _, callers) in entries.items():
+        for caller, (_, _, _, cumulative) in callers.items():
+            children.setdefault(caller, []).append((function, cumulative))
+    roots = [function for function, entry in entries.items() if not entry[4]]
+
+    stacks = {}
+    # (function, seconds of it spent on this path, path so far)
+    pending = [(root, entries[root][3], ()) for root in roots]
+    while pending:
+        function, seconds, path = pending.pop()
+        _, _, own_seconds, cumulative, _ = entries[function]
+        share = seconds / cumulative if cumulative else 0.0
+        stack = path + (frame_label(*function),)
+        if own_seconds * share > 0:
+            stacks[stack] = stacks.get(stack, 0.0) + own_seconds * share
+        for child, child_seconds in children.get(function, []):
+            child_label = frame_label(*child)
+            # Recursive calls are already counted in the caller
+            if child_label in stack or child_seconds * share < min_seconds:
+                continue
+            pending.append((child, child_seconds * share, stack))
+    return stacks
+
+# region Attribution
+def attribute(stacks: dict) -> dict:
+    """
+    Totals collapsed stacks by simulation phase and by the agent type
+    whose code was running.
+
+    A stack belongs to the innermost phase function on it, or 'other'.
+    It belongs to the agent type of the innermost function defined in an
+    agent module, or 'Simulation'.
+
+    Returns:
+        dict: 'phases' and 'agent_types', each a name -> total.
+    """
+    phases = {}
+    agent_types = {}
+    for stack, weight in stacks.items():
+        phase = 'other'
+        agent_type = 'Simulation'
+        for label in stack:
+            source = label_source(label)
+            phase = PHASE_FUNCTIONS.get(source, phase)
+            agent_type = AGENT_FILES.get(source[0], agent_type)
+        phases[phase] = phases.get(phase, 0) + weight
+        agent_types[agent_type] = agent_types.get(agent_type, 0) + weight
+    return {'phases': phases, 'agent_types': agent_types}
+
+def write_collapsed(stacks: dict, path: str, scale: float = 1) -> None:
+    """
+    Writes stacks in the collapsed format read by flamegraph tools, one
+    `frame;frame;frame count` line per stack.
+
+    Args:
+        stacks (dict): Stack -> weight.
+        path (str): File to write.
+        scale (float): Weights are multiplied by this and rounded, as
+            counts must be whole numbers.
+    """
+    with open(path, 'w') as f:
+        for stack, weight in sorted(stacks.items()):
+            count = round(weight * scale)
+            if count > 0:
+                # Semicolons separate frames
+                f.write(';'.join(label.replace(';', ',') for label in stack))
+                f.write(f' {count}\n')
+
+# region Run
+def profile_run(simulation: Simulation,
+                steps: int,
+                replace: bool = False,
+                display: bool = False,
+                mode: str = 'deterministic',
+                interval: float = 0.005) -> dict:
+    """
+    Runs a simulation under a profiler and writes the results to
+    `logs/<run_name>/profile`:
+
+    - `profile.pstats`: the cProfile statistics (deterministic mode)
+    - `stacks.collapsed`: flamegraph-ready stacks, in microseconds
+      (deterministic mode) or samples (sampling mode)
+    - `attribution.json`: totals per simulation phase and agent type
+
+    Args:
+        simulation (Simulation): A simulation with its environment set up.
+        steps (int): Number of simulation steps.
+        replace (bool): Replace removed objects.
+        display (bool): Record each foragers genes at each step.
+        mode (str): 'deterministic' traces every call with cProfile.
+            'sampling' samples the stack every `interval` seconds.
+        interval (float): Seconds between samples.
+
+    Returns:
+        dict: The attribution, with the unit of its totals.
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f'Unknown profile mode: {mode}. Choose from {PROFILE_MODES}.')
+    directory = f'logs/{simulation.run_name}/profile'
+    os.makedirs(directory, exist_ok=True)
+
+    if mode == 'deterministic':
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            simulation.run(steps=steps, replace=replace, display=display)
+        finally:
+            profiler.disable()
+        profiler.dump_stats(f'{directory}/profile.pstats')
+        stacks = collapse_pstats(pstats.Stats(profiler))
+        write_collapsed(stacks, f'{directory}/stacks.collapsed', scale=1e6)
+        attribution = {'mode': mode, 'unit': 'seconds', **attribute(stacks)}
+    else:
+        sampler = StackSampler(interval)
+        sampler.start()
+        try:
+            simulation.run(steps=steps, replace=replace, display=display)
+        finally:
+            sampler.stop()
+        write_collapsed(sampler.stacks, f'{directory}/stacks.collapsed')
+        attribution = {'mode': mode, 'unit': 'samples', 'interval': interval,
+                       'num_samples': sampler.num_samples, **attribute(sampler.stacks)}
+
+    with open(f'{directory}/attribution.json', 'w') as f:
+        json.dump(attribution, f, indent=2)
+    return attribution
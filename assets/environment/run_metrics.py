@@ -0,0 +1,95 @@
+from .event_log import EventLog
+
+# Phases of a simulation step, in the order they happen. Each forager's
+# turn is split into logging its genes, deciding where to go and
+# resolving what it finds there. Placing objects is timed separately
+# from the encounter that placed them. Checkpoints count as logging.
+PHASES = ['logging', 'gene trends', 'hunters', 'targets', 'decisions',
+          'encounters', 'placement']
+
+def encounter_counter(object) -> str:
+    """
+    Name of the counter for a forager stepping onto an object.
+    """
+    if object is None:
+        return 'empty cells'
+    return f'{type(object).__name__.lower()} encounters'
+
+class RunMetrics():
+    """
+    Timers per phase, counters per event type and the wall time of each
+    step of `Simulation.run`.
+
+    Totals cover every step run. Each step can also be streamed to a
+    line-delimited JSON file as
+    `[step, seconds, {phase: seconds}, {counter: count}]`.
+    """
+    def __init__(self) -> None:
+        self.phase_seconds = dict.fromkeys(PHASES, 0.0)
+        self.counters = {}
+        self.step_seconds = []
+        self.steps = []
+        # Per step file, open while running
+        self.stream = EventLog()
+        self.__step_phases = dict.fromkeys(PHASES, 0.0)
+        self.__step_counters = {}
+
+    def start_step(self) -> None:
+        """
+        Discards anything recorded since the last step ended.
+        """
+        self.__step_phases = dict.fromkeys(PHASES, 0.0)
+        self.__step_counters = {}
+
+    def add(self, phase: str, seconds: float) -> None:
+        """
+        Adds time to a phase of the current step.
+        """
+        self.__step_phases[phase] += seconds
+
+    def current(self, phase: str) -> float:
+        """
+        Time added to a phase so far in the current step.
+        """
+        return self.__step_phases[phase]
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        """
+        Adds to a counter of the current step.
+        """
+        self.__step_counters[counter] = self.__step_counters.get(counter, 0) + amount
+
+    def end_step(self, step: int, seconds: float) -> None:
+        """
+        Adds the current step to the totals and streams it.
+
+        Args:
+            step (int): The step.
+            seconds (float): Wall time of the whole step.
+        """
+        self.steps.append(step)
+        self.step_seconds.append(seconds)
+        for phase, phase_seconds in self.__step_phases.items():
+            self.phase_seconds[phase] += phase_seconds
+        for counter, amount in self.__step_counters.items():
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+        self.stream.emit(step, seconds, self.__step_phases, self.__step_counters)
+
+    def summary(self) -> dict:
+        """
+        Totals for every step run.
+
+        Returns:
+            dict: Number of steps, total and mean seconds per step, seconds
+                and share of step time per phase, and counters.
+        """
+        total = sum(self.step_seconds)
+        return {
+            'steps': len(self.step_seconds),
+            'total_seconds': total,
+            'mean_step_seconds': total / len(self.step_seconds) if self.step_seconds else 0.0,
+            'phase_seconds': dict(self.phase_seconds),
+            'phase_share': {phase: seconds / total if total else 0.0
+                            for phase, seconds in self.phase_seconds.items()},
+            'counters': dict(self.counters),
+        }
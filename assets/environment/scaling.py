@@ -0,0 +1,357 @@
+import csv
+import json
+import math
+import os
+import platform
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+
+import numpy as np
+
+from .benchmark import World, build_simulation, run_benchmark
+from .ensemble import Scenario
+
+# Default sweep
+GRID_SIZES = [15, 50, 150, 500]
+FORAGER_COUNTS = [4, 40, 400]
+HUNTER_COUNTS = [3, 30]
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'scaling_baseline.json')
+# Iterations of the reference workload, see `reference_speed`
+REFERENCE_ITERATIONS = 200_000
+
+# region Cases
+@dataclass(frozen=True)
+class ScalingCase():
+    """
+    One point of the scaling sweep: a square grid and its inhabitants.
+    There is as much food as foragers, and at least 6.
+    """
+    grid_size: int
+    num_foragers: int
+    num_hunters: int
+    num_ravines: int = 3
+    steps: int = 20
+
+    @property
+    def key(self) -> str:
+        """
+        Identifies the case in baseline files.
+        """
+        return f'grid={self.grid_size} foragers={self.num_foragers} hunters={self.num_hunters}'
+
+    @property
+    def num_food(self) -> int:
+        return max(6, self.num_foragers)
+
+    def scenario(self) -> Scenario:
+        return Scenario(num_foragers=self.num_foragers,
+                        num_hunters=self.num_hunters,
+                        num_ravines=self.num_ravines,
+                        num_food=self.num_food,
+                        grid_height=self.grid_size,
+                        grid_width=self.grid_size,
+                        steps=self.steps)
+
+def scaling_cases(grid_sizes: list[int] = GRID_SIZES,
+                  forager_counts: list[int] = FORAGER_COUNTS,
+                  hunter_counts: list[int] = HUNTER_COUNTS,
+                  steps: int = 20) -> list[ScalingCase]:
+    """
+    Every combination of grid size, forager count and hunter count where
+    the foragers, hunters and food fill at most a quarter of the grid.
+    """
+    cases = []
+    for grid_size in grid_sizes:
+        for num_foragers in forager_counts:
+            for num_hunters in hunter_counts:
+                case = ScalingCase(grid_size, num_foragers, num_hunters, steps=steps)
+                if num_foragers + num_hunters + case.num_food <= grid_size * grid_size // 4:
+                    cases.append(case)
+    return cases
+
+# region Measurement
+def measure(case: ScalingCase,
+            seed: int = 0,
+            repeats: int = 3,
+            measure_memory: bool = True) -> dict:
+    """
+    Measures the throughput of `Simulation.run` for a case, with logging
+    off. The simulation is rebuilt from the same seed for each repeat and
+    the fastest is kept. Peak memory is measured in a separate run with
+    tracemalloc, which slows the simulation down.
+
+    Args:
+        case (ScalingCase): What to simulate.
+        seed (int): Seed for the random number generator.
+        repeats (int): Number of timed runs.
+        measure_memory (bool): Also measure peak memory.
+
+    Returns:
+        dict: The case, steps run, steps per second, and the peak bytes
+            allocated while running (or None).
+    """
+    best = None
+    steps_run = 0
+    for _ in range(repeats):
+        simulation = build_simulation(case.scenario(), seed)
+        start = time.perf_counter()
+        simulation.run(steps=case.steps, replace=False, display=False)
+        elapsed = time.perf_counter() - start
+        # Steps stop early if every forager is lost
+        steps_run = len(simulation.gene_trends['average agility'])
+        if best is None or elapsed < best:
+            best = elapsed
+
+    peak_memory = None
+    if measure_memory:
+        simulation = build_simulation(case.scenario(), seed)
+        tracemalloc.start()
+        try:
+            simulation.run(steps=case.steps, replace=False, display=False)
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        **asdict(case),
+        'key': case.key,
+        'steps_run': steps_run,
+        'steps_per_sec': steps_run / best if best > 0 else 0.0,
+        'peak_memory': peak_memory,
+    }
+
+def reference_speed(repeats: int = 5) -> float:
+    """
+    Speed of this machine on a fixed workload that does not use the
+    simulation: dictionary, list and arithmetic work in Python, like a
+    simulation step, and small NumPy reductions. Throughput is divided
+    by this so baselines can be compared across machines and across
+    changes in machine load.
+
+    Args:
+        repeats (int): Number of timed runs. The fastest is kept.
+
+    Returns:
+        float: Iterations per second.
+    """
+    targets = np.arange(256, dtype=np.int32).reshape(-1, 2)
+    best = None
+    for _ in range(repeats):
+        cells = {}
+        items = []
+        start = time.perf_counter()
+        for i in range(REFERENCE_ITERATIONS):
+            key = (i % 97, i % 89)
+            cells[key] = cells.get(key, 0) + (i * 7) % 13
+            items.append(key)
+            if len(items) > 64:
+                items.clear()
+            if i % 1000 == 0:
+                int(np.abs(targets - key).sum(axis=1).argmin())
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return REFERENCE_ITERATIONS / best
+
+def scaling_exponents(sizes: list[int], seconds: list[float]) -> list[float]:
+    """
+    Slope of log(time) against log(grid size) between consecutive sizes.
+    1 means time grows with the side of the grid, 2 with its area, i.e.
+    quadratically in the side.
+
+    Args:
+        sizes (list[int]): Grid sizes in ascending order.
+        seconds (list[float]): Time taken at each size.
+
+    Returns:
+        list[float]: One exponent per pair of sizes.
+    """
+    exponents = []
+    for (size_a, time_a), (size_b, time_b) in zip(zip(sizes, seconds), zip(sizes[1:], seconds[1:])):
+        if time_a > 0 and time_b > 0:
+            exponents.append(math.log(time_b / time_a) / math.log(size_b / size_a))
+        else:
+            exponents.append(float('nan'))
+    return exponents
+
+def step_curves(results: list[dict]) -> list[dict]:
+    """
+    Seconds per step against grid size for each forager and hunter count.
+    """
+    curves = {}
+    for result in results:
+        curves.setdefault((result['num_foragers'], result['num_hunters']), []).append(result)
+    rows = []
+    for (num_foragers, num_hunters), points in sorted(curves.items()):
+        points = sorted(points, key=lambda point: point['grid_size'])
+        sizes = [point['grid_size'] for point in points]
+        seconds = [1 / point['steps_per_sec'] if point['steps_per_sec'] else 0.0 for point in points]
+        rows.append({
+            'curve': f'step foragers={num_foragers} hunters={num_hunters}',
+            'grid_sizes': sizes,
+            'seconds': seconds,
+            'exponents': scaling_exponents(sizes, seconds),
+        })
+    return rows
+
+def subsystem_curves(grid_sizes: list[int] = GRID_SIZES,
+                     density: float = 0.02,
+                     seed: int = 0,
+                     repeats: int = 3) -> list[dict]:
+    """
+    Seconds per call of each micro-benchmark against grid size, at a fixed
+    density, showing where each subsystem stops scaling linearly.
+    """
+    results = [run_benchmark(name, World(size=size, density=density), seed, repeats)
+               for size in grid_sizes
+               for name in ('hunter_next_move', 'forager_actions_init', 'set_motivation',
+                            'destination_coordinates', 'random_empty_cell', 'place_object')]
+    rows = []
+    for name in dict.fromkeys(result['benchmark'] for result in results):
+        seconds = [result['best'] for result in results if result['benchmark'] == name]
+        rows.append({
+            'curve': f'{name} density={density}',
+            'grid_sizes': list(grid_sizes),
+            'seconds': seconds,
+            'exponents': scaling_exponents(list(grid_sizes), seconds),
+        })
+    return rows
+
+# region Baseline
+def machine_info() -> dict:
+    """
+    The machine and software a measurement was made with.
+    """
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'platform': platform.platform(),
+    }
+
+def save_baseline(results: list[dict],
+                  config: dict,
+                  path: str = BASELINE_PATH) -> None:
+    """
+    Saves the throughput, reference speed and peak memory of each case
+    as the baseline, with the machine and configuration they were
+    measured with.
+
+    Args:
+        results (list[dict]): Results of `run_scaling`.
+        config (dict): Seed, repeats, steps and grid sizes used.
+        path (str): File to save to.
+    """
+    with open(path, 'w') as f:
+        json.dump({
+            **machine_info(),
+            'config': config,
+            'cases': {result['key']: {'steps_per_sec': result['steps_per_sec'],
+                                      'reference_per_sec': result['reference_per_sec'],
+                                      'peak_memory': result['peak_memory']}
+                      for result in results},
+        }, f, indent=2)
+
+def load_baseline(path: str = BASELINE_PATH) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+def compare_to_baseline(results: list[dict],
+                        baseline: dict,
+                        threshold: float = 0.25) -> list[dict]:
+    """
+    Compares throughput to the baseline. Where both have a reference
+    speed, the baseline is first scaled by how much faster or slower the
+    reference workload ran next to this case than next to the baseline
+    case, so the check is relative to the machine it runs on.
+
+    Args:
+        results (list[dict]): Results of `run_scaling`.
+        baseline (dict): Loaded with `load_baseline`.
+        threshold (float): Largest acceptable drop in steps per second,
+            as a fraction of the baseline.
+
+    Returns:
+        list[dict]: A row per case with its expected and current steps
+            per second, the change, and whether it regressed. Cases not
+            in the baseline are not compared.
+    """
+    rows = []
+    for result in results:
+        expected = baseline['cases'].get(result['key'])
+        if expected is None:
+            continue
+        scale = 1.0
+        if result.get('reference_per_sec') and expected.get('reference_per_sec'):
+            scale = result['reference_per_sec'] / expected['reference_per_sec']
+        expected_steps_per_sec = expected['steps_per_sec'] * scale
+        change = result['steps_per_sec'] / expected_steps_per_sec - 1
+        rows.append({
+            'key': result['key'],
+            'baseline_steps_per_sec': expected_steps_per_sec,
+            'steps_per_sec': result['steps_per_sec'],
+            'change': change,
+            'baseline_peak_memory': expected['peak_memory'],
+            'peak_memory': result['peak_memory'],
+            'regressed': change < -threshold,
+        })
+    return rows
+
+def format_report(rows: list[dict], threshold: float) -> str:
+    """
+    A table of the comparison, with regressions marked.
+    """
+    lines = [f"{'case':<36} {'expected':>12} {'current':>12} {'change':>8} {'peak MB':>9}"]
+    for row in rows:
+        memory = '' if row['peak_memory'] is None else f"{row['peak_memory'] / 2**20:9.2f}"
+        lines.append(f"{row['key']:<36} {row['baseline_steps_per_sec']:>12.1f} "
+                     f"{row['steps_per_sec']:>12.1f} {row['change']:>+8.1%} {memory:>9}"
+                     + ('  REGRESSED' if row['regressed'] else ''))
+    regressions = sum(row['regressed'] for row in rows)
+    lines.append(f'{regressions} of {len(rows)} cases dropped more than {threshold:.0%} '
+                 'below the baseline steps per second.')
+    return '\n'.join(lines)
+
+# region Run
+def run_scaling(cases: list[ScalingCase],
+                run_name: str = 'scaling',
+                seed: int = 0,
+                repeats: int = 3,
+                measure_memory: bool = True,
+                subsystems: bool = True) -> dict:
+    """
+    Measures every case and the scaling curves, and saves them to
+    `logs/<run_name>`: `results.json`, and `curves.csv` with one row per
+    curve and grid size.
+
+    Returns:
+        dict: Results per case, each with the reference speed measured
+            just before it, and the curves.
+    """
+    results = []
+    for case in cases:
+        # Measured next to each case so changes in machine load cancel out
+        reference = reference_speed()
+        results.append({**measure(case, seed, repeats, measure_memory),
+                        'reference_per_sec': reference})
+    curves = step_curves(results)
+    if subsystems:
+        grid_sizes = sorted({case.grid_size for case in cases})
+        curves += subsystem_curves(grid_sizes, seed=seed, repeats=repeats)
+
+    os.makedirs(f'logs/{run_name}', exist_ok=True)
+    with open(f'logs/{run_name}/results.json', 'w') as f:
+        json.dump({**machine_info(), 'results': results, 'curves': curves}, f, indent=2)
+    with open(f'logs/{run_name}/curves.csv', 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['curve', 'grid_size', 'seconds', 'exponent'])
+        for curve in curves:
+            # The first size has nothing to compare to
+            exponents = [''] + curve['exponents']
+            for size, seconds, exponent in zip(curve['grid_sizes'], curve['seconds'], exponents):
+                writer.writerow([curve['curve'], size, seconds, exponent])
+    return {'results': results, 'curves': curves}
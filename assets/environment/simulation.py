@@ -1,15 +1,32 @@
-import random
-import matplotlib.pyplot as plt
-import seaborn as sns
-sns.set_theme()
 import os 
 import shutil
-import sys
+import gzip
+import hashlib
+import json
+import pickle
+import random
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
 
 from ..agents.forager import Forager, ForagerActions
 from ..agents.hunter import Hunter
 from ..agents.food import Food
 from ..agents.ravine import Ravine
+from ..agents.forager_config import ForagerConfig
+from ..agents.population import PopulationStore
+from ..agents.motivation_metrics import Encounter
+from ..agents.entity_ids import IdAllocator
+from .entity_index import EntityIndex
+from .free_cells import FreeCells
+from .grid import GRID_BACKENDS
+from .grid_history import GridHistoryWriter
+from .target_queries import StepTargets
+from .charts import CHARTS, draw_chart
+from .run_metrics import RunMetrics, encounter_counter
+from .memory_report import MemoryReport
+from . import event_log
+from .event_log import EventLog, LogLevel
 
 # * class SimulationAnalytics is appended to the bottom of this file
 # * This is to avoid a circular import error.
@@ -19,18 +36,96 @@ class Simulation():
     """
     The environment in which foragers search for food.
     """
-    def __init__(self, width: int, height: int, run_name: str) -> None:
+    def __init__(self, 
+                 width: int, 
+                 height: int, 
+                 run_name: str, 
+                 forager_config: ForagerConfig = None,
+                 grid_backend: str = 'object',
+                 log_level: str = 'full',
+                 log_every_n_steps: int = 1,
+                 log_every_n_foragers: int = 1,
+                 record_grid_history: bool = True,
+                 keyframe_interval: int = 25,
+                 instrument: bool = False,
+                 stream_metrics: bool = False,
+                 memory_every_n_steps: int = None) -> None:
+        """
+        Args:
+            width (int): Width of grid.
+            height (int): Height of grid.
+            run_name (str): Name of directory to store information.
+            forager_config (ForagerConfig): Configuration for foragers added
+                during the simulation. Loaded from `forager_config.toml`
+                if not given.
+            grid_backend (str): How the grid is stored, 'object' for rows
+                of objects or 'array' for NumPy arrays of type codes and
+                handles. Both produce the same simulation.
+            log_level (str): How much is recorded in the event log, 'off', 
+                'summary', 'events' or 'full'. See `LogLevel`.
+            log_every_n_steps (int): Only record every nth step.
+            log_every_n_foragers (int): Only record the actions of every 
+                nth forager added to the simulation.
+            record_grid_history (bool): Write the grid at every step to a 
+                replay file, read with `GridHistoryReader`.
+            keyframe_interval (int): Steps between full copies of the grid
+                in the replay file. Other steps store only changed cells.
+            instrument (bool): Time each phase of every step and count 
+                encounters and placements in `metrics`. See `RunMetrics`.
+            stream_metrics (bool): Also write the metrics of each step to
+                `logs/<run_name>/simulation/metrics.jsonl`.
+            memory_every_n_steps (int): Trace memory allocations and report
+                what is using memory every nth step to 
+                `logs/<run_name>/simulation/memory.jsonl`. See `MemoryReport`.
+        """
+        if grid_backend not in GRID_BACKENDS:
+            raise ValueError(f'Unknown grid backend: {grid_backend}. '
+                             f'Choose from {list(GRID_BACKENDS)}.')
+        if log_level.upper() not in LogLevel.__members__:
+            raise ValueError(f'Unknown log level: {log_level}. '
+                             f'Choose from {[level.lower() for level in LogLevel.__members__]}.')
+        if log_every_n_steps < 1 or log_every_n_foragers < 1:
+            raise ValueError('Log sampling intervals must be at least 1.')
         self.width = width
         self.height = height
-        self.grid = [[None for _ in range(width)] for _ in range(height)]
+        # IDs of objects, given as they are placed
+        self.ids = IdAllocator()
+        self.grid = GRID_BACKENDS[grid_backend](width, height)
+        # Positions of foragers, hunters and food, kept in sync with the grid
+        self.entity_index = EntityIndex((Food, Forager, Hunter))
+        # Empty cells, kept in sync with the grid
+        self.free_cells = FreeCells(width, height)
         self.object_count = 0
         self.area = self.width * self.height
         self.foragers: list[Forager] = []
+        # Genes and state of foragers, one row per forager
+        self.population = PopulationStore()
         self.hunters: list[Hunter] = []
-        self.grid_history = []
+        # Replay file writer, open while running
+        self.grid_history: GridHistoryWriter = None
+        self.record_grid_history = record_grid_history
+        self.keyframe_interval = keyframe_interval
+        # Destinations of every forager, resolved at the start of each step
+        self.step_targets = None
+        # Record of everything that happens, written while running
+        self.events = EventLog()
+        self.log_level = LogLevel[log_level.upper()]
+        self.log_every_n_steps = log_every_n_steps
+        self.log_every_n_foragers = log_every_n_foragers
+        # Phase timers and counters, None unless instrumented
+        self.metrics = RunMetrics() if instrument else None
+        self.stream_metrics = stream_metrics
+        # Memory snapshots, None unless asked for
+        self.memory = (MemoryReport(memory_every_n_steps) 
+                       if memory_every_n_steps is not None else None)
         self.num_steps = 0
+        # Step that run() starts from, set when resuming from a checkpoint
+        self.next_step = 0
         self.forager_age_limit = 50
         self.run_name = run_name
+        # Shared by foragers added during the simulation
+        self.forager_config = (forager_config if forager_config is not None 
+                               else ForagerConfig.from_toml())
         
         # attributes used for analysis
         self.gene_trends = {
@@ -65,7 +160,9 @@ class Simulation():
     def run(self, 
             steps: int, 
             replace: bool, 
-            display: bool) -> None:
+            display: bool,
+            checkpoint_every: int = None,
+            checkpoint_path: str = None) -> None:
         """
         Runs the simulation.
         
@@ -76,8 +173,12 @@ class Simulation():
         Args:
             steps (int): Number of simulation steps.
             replace (bool): Replace removed objects. Food is always replaced. 
-            display (bool): Output information to file at each time step.
-            run_name (str): Name of directory to store informaton.
+            display (bool): Record each foragers genes in the event log at 
+                each time step.
+            checkpoint_every (int): Save a checkpoint at the start of every
+                nth step. See `checkpoint()`.
+            checkpoint_path (str): File to save checkpoints to. Defaults to
+                `logs/<run_name>/checkpoint.gz`.
 
         Raises:
             MoveError: Simulation ends if an invalid move has been made.
@@ -85,30 +186,76 @@ class Simulation():
         """
 
         self.num_steps = steps
+        if checkpoint_path is None:
+            checkpoint_path = f'logs/{self.run_name}/checkpoint.gz'
         
-        # write all information to file instead of stdout
-        if os.path.exists(f'logs/{self.run_name}/simulation'):
-            shutil.rmtree(f'logs/{self.run_name}/simulation')
-        
-        os.makedirs(f'logs/{self.run_name}/simulation/')
-        
-        with open(f'logs/{self.run_name}/simulation/log.txt', 'w') as file:
-            stdout = sys.stdout
-            sys.stdout = file
+        events = self.events
+        level = self.log_level
+        metrics = self.metrics
+        memory = self.memory
+        clock = time.perf_counter
+        start = self.next_step
+        if start == 0:
+            # write all information to the event log
+            if os.path.exists(f'logs/{self.run_name}/simulation'):
+                shutil.rmtree(f'logs/{self.run_name}/simulation')
             
-            for i, step in enumerate(range(steps)):
-                print('*' + '*' * 52 + '*')
-                print(f"{'Step'} {step:<45}\n")
-                self.__display_simulation()
+            os.makedirs(f'logs/{self.run_name}/simulation/')
+            
+            if level > LogLevel.OFF:
+                events.open(f'logs/{self.run_name}/simulation/events.jsonl')
+            if self.record_grid_history:
+                self.grid_history = GridHistoryWriter(f'logs/{self.run_name}/simulation/grid_history.bin',
+                                                      self.grid, self.keyframe_interval)
+            if metrics is not None and self.stream_metrics:
+                metrics.stream.open(f'logs/{self.run_name}/simulation/metrics.jsonl')
+            if memory is not None:
+                memory.stream.open(f'logs/{self.run_name}/simulation/memory.jsonl')
+        # Otherwise the log files were reopened on resume
+        trace_memory = memory is not None and not tracemalloc.is_tracing()
+        if trace_memory:
+            tracemalloc.start()
+        try:
+            for i, step in enumerate(range(start, steps)):
+                if metrics is not None:
+                    metrics.start_step()
+                    step_start = phase_start = clock()
+                if checkpoint_every and step != start and step % checkpoint_every == 0:
+                    self.next_step = step
+                    self.checkpoint(checkpoint_path)
+                if memory is not None and step % memory.every_n_steps == 0:
+                    memory.snapshot(step, self)
+                if self.grid_history is not None:
+                    self.grid_history.write_frame(step)
+                record_step = level > LogLevel.OFF and step % self.log_every_n_steps == 0
+                record_actions = record_step and level >= LogLevel.EVENTS
+                record_genes = record_step and level >= LogLevel.FULL
+                if record_step:
+                    events.emit(event_log.STEP, step)
+                if record_genes:
+                    events.emit(event_log.FRAME, step, self.grid.render())
+                if metrics is not None:
+                    now = clock()
+                    metrics.add('logging', now - phase_start)
+                    phase_start = now
                 try:
                     self.__gather_gene_trend_data()
                 except ZeroDivisionError:
-                    print('All foragers have been lost!')
+                    if record_step:
+                        events.emit(event_log.LOST, step)
                     return
+                if metrics is not None:
+                    now = clock()
+                    metrics.add('gene trends', now - phase_start)
+                    phase_start = now
                 # hunters move
                 for hunter in self.hunters:
                     if not hunter.alive:
                         continue
+                    hunter_x, hunter_y = hunter.current_coords
+                    if self.grid.get(hunter_x, hunter_y) is not hunter:
+                        # Hunter is no longer in the grid
+                        continue
                     from_xy, to_xy = hunter.get_next_move(self.grid, self.height, self.width)
                     if to_xy == from_xy:
                         continue
@@ -119,29 +266,50 @@ class Simulation():
                         new_x = to_xy[0] 
                         new_y = to_xy[1]
                     
-                        self.grid[new_y][new_x] = self.grid[from_y][from_x]
-                        self.grid[from_y][from_x] = None
+                        self.__move_object(from_x, from_y, new_x, new_y)
+                        hunter.current_coords = (new_x, new_y)
+                        if metrics is not None:
+                            metrics.count('hunter moves')
+                if metrics is not None:
+                    now = clock()
+                    metrics.add('hunters', now - phase_start)
+                    phase_start = now
                 
                 # foragers move
+                self.step_targets = StepTargets(self.entity_index.locate(Forager), 
+                                                self.entity_index.locate(Food))
+                # Foragers die of old age to make room for offspring
+                self.population.retire(self.forager_age_limit)
+                if metrics is not None:
+                    metrics.add('targets', clock() - phase_start)
                 for i, forager in enumerate(self.foragers):
                     if step % 10 == 0:
                         forager.mated_with.clear()
                         forager.incompatible_with.clear()
                         # Analyse attribute trends
-
-                    if forager.steps_alive >= self.forager_age_limit:
-                        # Forager dies of old age to make room for offspring
-                        forager.alive = False
                     
                     if not forager.alive:
                         continue
                     forager.simulation_step = step
+                    forager.record_actions = (record_actions and 
+                                              forager.population_row % self.log_every_n_foragers == 0)
+                    forager.record_genes = record_genes and forager.record_actions
+                    if metrics is not None:
+                        phase_start = clock()
                     forager.log_genes(display, i)
-                    print()
+                    if metrics is not None:
+                        now = clock()
+                        metrics.add('logging', now - phase_start)
+                        phase_start = now
                     # Coordinates of next step
                     to_x, to_y = forager.get_next_step(self)
+                    if metrics is not None:
+                        now = clock()
+                        metrics.add('decisions', now - phase_start)
+                        phase_start = now
+                        placement_start = metrics.current('placement')
                     # Object at next step
-                    next_step_obj = self.grid[to_y][to_x]
+                    next_step_obj = self.grid.get(to_x, to_y)
                     if isinstance(next_step_obj, Food):
                         # Forager eats food
                         self.__forager_finds_food(forager, to_x, to_y, replace, step)
@@ -149,7 +317,8 @@ class Simulation():
                     elif isinstance(next_step_obj, Hunter):
                         # Forager engages hunter
                         if forager.hunger_increase():
-                            self.__forager_finds_hunter(forager, to_x, to_y, replace, step)
+                            self.__forager_finds_hunter(forager, to_x, to_y, replace, step, 
+                                                        record_step)
                             forager.steps_alive += 1
                         else:
                             self.__forager_starves(forager, replace, step)
@@ -177,14 +346,79 @@ class Simulation():
                             self.__forager_starves(forager, replace, step)
                     else:
                         raise MoveError
-                print('*' + '-' * 52 + '*')
-                if step != steps - 1:                
-                    print() 
-            sys.stdout = stdout
+                    if metrics is not None:
+                        # Objects placed are timed as placement
+                        placed = metrics.current('placement') - placement_start
+                        metrics.add('encounters', clock() - phase_start - placed)
+                        metrics.count(encounter_counter(next_step_obj))
+                if record_step:
+                    events.emit(event_log.STEP_END, step, step == steps - 1)
+                if metrics is not None:
+                    metrics.end_step(step, clock() - step_start)
+        finally:
+            self.next_step = 0
+            events.close()
+            if metrics is not None:
+                metrics.stream.close()
+            if memory is not None:
+                memory.stream.close()
+            if trace_memory:
+                tracemalloc.stop()
+            if self.grid_history is not None:
+                self.grid_history.close()
+                self.grid_history = None
+            if level >= LogLevel.FULL:
+                self.population.history.save(f'logs/{self.run_name}/simulation/gene_history.npy')
             
+    def checkpoint(self, path: str) -> None:
+        """
+        Saves the whole simulation and the state of the random number 
+        generator. `Simulation.resume()` continues from here exactly as 
+        if the simulation had not stopped.
+        
+        The file is compressed and replaced atomically, so an interrupted
+        write never leaves a partial checkpoint.
+
+        Args:
+            path (str): File to save to.
+        """
+        state = {
+            'simulation': self,
+            'random_state': random.getstate(),
+        }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'wb') as f:
+            with gzip.GzipFile(fileobj=f, mode='wb', compresslevel=6, mtime=0) as compressed:
+                pickle.dump(state, compressed, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    
+    @classmethod
+    def resume(cls, path: str) -> 'Simulation':
+        """
+        Loads a checkpoint and restores the random number generator.
+        Calling `run()` with the original arguments finishes the run.
+        Log files are truncated back to the checkpoint.
+
+        Args:
+            path (str): Checkpoint file.
+
+        Returns:
+            Simulation: The simulation as it was when saved.
+        """
+        with gzip.open(path, 'rb') as f:
+            state = pickle.load(f)
+        random.setstate(state['random_state'])
+        return state['simulation']
+    
     def setup_environment(self, objects: list) -> None:
         """
         Distributes a collection of objects in the simulation. 
+        Objects are given IDs in the order they are listed.
 
         Args:
             objects (list): Collection of objects.
@@ -212,23 +446,18 @@ class Simulation():
         for forager in self.foragers:
             forager.get_log(run_name)
                 
-    def __display_simulation(self) -> None:
-        """
-        Outputs simulation.
-        """
-        d = {
-            Forager: 'F',
-            Ravine: 'R',
-            Hunter: 'H',
-            Food: '*'
-        }
-        for row in self.grid:
-            print(" ".join([d.get(type(cell), '.') for cell in row]))
-    
     def __place_object(self, object: Forager | Hunter | Food | Ravine) -> None:
         """
-        Place an object in the environment. 
+        Place an object in the environment. Objects without an ID are
+        given the next one.
         """
+        metrics = self.metrics
+        if metrics is not None:
+            start = time.perf_counter()
+        if object.id is None:
+            object.id = self.ids.allocate()
+        else:
+            self.ids.reserve(object.id)
         def place_ravine(x, y, ravine_x, ravine_y, ravine):
             """
             Iterate through coordinates and place ravine markers.
@@ -236,7 +465,8 @@ class Simulation():
             for i in range(ravine_y + 1):
                 for j in range(ravine_x + 1):
                     # markers are placed up and to the right
-                    self.grid[y - i][x + j] = ravine
+                    # rows above the top edge wrap around to the bottom
+                    self.__set_cell(x + j, (y - i) % self.height, ravine)
                     
         x, y = self.__find_random_empty_cell()
         if isinstance(object, Ravine):
@@ -257,27 +487,38 @@ class Simulation():
             # Otherwise if desired cell is in bounds
             if self.__get_cell(x, y) == None:
                 # Desired cell is empty then place objects
-                self.grid[y][x] = object
+                self.__set_cell(x, y, object)
                 if isinstance(object, Forager):
                     # Tell forager where it is
+                    object.join_population(self.population)
+                    object.events = self.events
                     object.current_coords = (x, y)
                     # Simulation attribute to keep track of foragers
-                    self.foragers.append(object)
+                    self.__list_forager(object)
                 elif isinstance(object, Hunter):
+                    # Tell hunter where it is
+                    object.current_coords = (x, y)
                     # Simulation attribute to keep track of hunters
                     self.hunters.append(object)
             else:
                 # Desired cell is not empty so find a new one
                 x, y = self.__find_random_empty_cell()
-                self.grid[y][x] = object
+                self.__set_cell(x, y, object)
                 if isinstance(object, Forager):
                     # Tell forager where it is
+                    object.join_population(self.population)
+                    object.events = self.events
                     object.current_coords = (x, y)
                     # Simulation attribute to keep track of foragers
-                    self.foragers.append(object)
+                    self.__list_forager(object)
                 elif isinstance(object, Hunter):
+                    # Tell hunter where it is
+                    object.current_coords = (x, y)
                     # Simulation attribute to keep track of hunters
                     self.hunters.append(object)
+        if metrics is not None:
+            metrics.add('placement', time.perf_counter() - start)
+            metrics.count('placements')
             
     def __ravine_buffer(self, x: int, y: int, 
                         ravine_width: int, ravine_height: int) -> bool:
@@ -308,9 +549,56 @@ class Simulation():
             list | None: object or None.
         """
         if 0 <= x < self.width and 0 <= y < self.height:
-            return self.grid[y][x]
+            return self.grid.get(x, y)
         return None
 
+    def __set_cell(self, 
+                   x: int, 
+                   y: int, 
+                   object: Forager | Hunter | Food | Ravine | None) -> None:
+        """
+        Writes an object (or None) to a cell and updates the entity index
+        and empty cells. All changes to the grid go through here.
+        """
+        previous = self.grid.get(x, y)
+        if previous is None:
+            if object is not None:
+                self.free_cells.occupy(x, y)
+        elif self.entity_index.is_tracked(previous):
+            self.entity_index.remove(previous, x, y)
+        self.grid.set(x, y, object)
+        if self.grid_history is not None:
+            self.grid_history.mark(x, y)
+        if object is None:
+            if previous is not None:
+                self.free_cells.vacate(x, y)
+        elif self.entity_index.is_tracked(object):
+            self.entity_index.add(object, x, y)
+    
+    def __move_object(self, 
+                      from_x: int, 
+                      from_y: int, 
+                      to_x: int, 
+                      to_y: int) -> None:
+        """
+        Moves the object at (from_x, from_y) to (to_x, to_y), replacing
+        anything that was there.
+        """
+        self.__set_cell(to_x, to_y, self.grid.get(from_x, from_y))
+        self.__set_cell(from_x, from_y, None)
+
+    def __move_forager(self, forager: Forager, to_x: int, to_y: int) -> None:
+        """
+        Moves a forager to (to_x, to_y), replacing anything that was there,
+        and tells it its new position.
+        """
+        from_xy = forager.current_coords
+        self.__move_object(from_xy[0], from_xy[1], to_x, to_y)
+        forager.current_coords = (to_x, to_y)
+        if forager.record_actions:
+            self.events.emit(event_log.MOVE, forager.simulation_step, forager.id, 
+                             from_xy, (to_x, to_y))
+
     def __find_random_empty_cell(self) -> tuple[int, int]:
         """
         Finds a random empty cell.
@@ -318,15 +606,10 @@ class Simulation():
         Returns:
             tuple(int, int): (x,y) coordinates.
         """
-        empty_cells = []
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.grid[y][x] is None:
-                    empty_cells.extend([(x,y)])
-        if len(empty_cells) == 0:
+        if len(self.free_cells) == 0:
             raise GridFull
         else:
-            return random.choice(empty_cells)
+            return self.free_cells.random_cell()
         
     def __forager_finds_food(self, 
                              forager: Forager, 
@@ -338,17 +621,12 @@ class Simulation():
         Handles removing the food from (to_x, to_y) and moving
         the forager there. 
         """
-        # Foragers current coordinates
-        from_x = forager.current_coords[0]
-        from_y = forager.current_coords[1]
         # Get food object
-        food = self.grid[to_y][to_x]
+        food = self.grid.get(to_x, to_y)
         # Forager eats the food
         forager.eat(food)
         # Move forager to cell with food and tell it its new position
-        self.grid[to_y][to_x] = self.grid[from_y][from_x]
-        self.grid[from_y][from_x] = None
-        forager.current_coords = (to_x, to_y)
+        self.__move_forager(forager, to_x, to_y)
         # Add for simulation metrics
         self.total_sustenance_gained += food.sustenance_granted
         self.simulation_metrics['total_sustenance_gained'].append(
@@ -363,7 +641,8 @@ class Simulation():
                                to_x: int, 
                                to_y: int, 
                                replace: bool,
-                               step: int) -> None:
+                               step: int,
+                               record_step: bool) -> None:
         """
         The forager fights or flees the hunter.
         If the forager fights and wins it takes the place of the hunter
@@ -380,47 +659,36 @@ class Simulation():
             to_x (int): Desired x coordinate.
             to_y (int): Desired y coordinate.
             replace (bool): Replace lost foragers or hunters.
+            step (int): Current step.
+            record_step (bool): Record replacement foragers in the event log.
         """
         # Foragers current coordinates
         from_x = forager.current_coords[0]
         from_y = forager.current_coords[1]
         # Get hunter object
-        hunter = self.grid[to_y][to_x]
+        hunter = self.grid.get(to_x, to_y)
         if 'hide from hunter' in forager.evolved_abilities:
             # Forager moves to a random location without danger
-            self.grid[from_y][from_x] = None
+            self.__set_cell(from_x, from_y, None)
             self.__place_object(forager)
-            forager.motivation_metrics['hunter encounters']['times hidden'] += 1
+            forager.motivation_metrics.encounter(Encounter.TIMES_HIDDEN)
         elif 'zig zag past hunter' in forager.evolved_abilities:
             fa = ForagerActions(environment=self, forager=forager)
             steps = fa.steps_to_motivation(forager.current_motivation)
-            forager.motivation_metrics['hunter encounters']['times zig zagged'] += 1
+            forager.motivation_metrics.encounter(Encounter.TIMES_ZIG_ZAGGED)
             if len(steps) > 2:
-                if self.grid[2] != None:
-                    # Move three steps ahead
-                    if self.grid[steps[2][1]][steps[2][0]] == None:
-                        self.grid[steps[2][1]][steps[2][0]] = self.grid[from_y][from_x]
-                        self.grid[from_y][from_x] = None
-                        forager.current_coords = (steps[2][0], steps[2][1])
-                elif self.grid[1] != None:
-                    # move two steps ahead if 3 isn't valid
-                    if self.grid[steps[1][1]][steps[1][0]] == None:
-                        self.grid[steps[2][1]][steps[2][0]] = self.grid[from_y][from_x]
-                        self.grid[from_y][from_x] = None
-                        forager.current_coords = (steps[2][0], steps[2][1])
+                # Move three steps ahead
+                if self.grid.is_empty(steps[2][0], steps[2][1]):
+                    self.__move_forager(forager, steps[2][0], steps[2][1])
         else:
             if 'camouflage' in forager.evolved_abilities:
-                self.grid[to_y][to_x] = self.grid[from_y][from_x]
-                self.grid[from_y][from_x] = None
-                forager.current_coords = (to_x, to_y)  
-                forager.motivation_metrics['hunter encounters']['times camouflaged'] += 1
+                self.__move_forager(forager, to_x, to_y)
+                forager.motivation_metrics.encounter(Encounter.TIMES_CAMOUFLAGED)
                 return
             decision, win = forager.engage_hunter(hunter)
             if decision == 'fight' and win:
                 # Move forager to hunters location
-                self.grid[to_y][to_x] = self.grid[from_y][from_x]
-                self.grid[from_y][from_x] = None
-                forager.current_coords = (to_x, to_y)
+                self.__move_forager(forager, to_x, to_y)
                 self.total_hunters_lost += 1
                 self.simulation_metrics['total_hunters_lost'].append(
                     (step, self.total_hunters_lost)
@@ -431,29 +699,30 @@ class Simulation():
                     self.__place_object(h)
             elif decision == 'fight' and not win:
                 # Forager lost and is removed
-                self.grid[from_y][from_x] = None
-                self.foragers.remove(forager)
+                self.__set_cell(from_x, from_y, None)
+                self.__unlist_forager(forager)
                 self.total_foragers_lost += 1
                 self.simulation_metrics['total_foragers_lost'].append(
                     (step, self.total_foragers_lost)
                 )
             elif decision == 'flee' and win:
                 # Forager is placed in a random location
-                self.grid[from_y][from_x] = None
+                self.__set_cell(from_x, from_y, None)
                 self.__place_object(forager)
             elif decision == 'flee' and not win:
                 # Forager is caught and removed
-                self.grid[from_y][from_x] = None
-                self.foragers.remove(forager)
+                self.__set_cell(from_x, from_y, None)
+                self.__unlist_forager(forager)
                 self.total_foragers_lost += 1
                 self.simulation_metrics['total_foragers_lost'].append(
                     (step, self.total_foragers_lost)
                 )
             if not win and replace:
                 # add new forager back to the environment
-                new_forager = Forager()
-                print('adding new forager', new_forager.id)
+                new_forager = Forager(config=self.forager_config)
                 self.__place_object(new_forager)
+                if record_step:
+                    self.events.emit(event_log.SPAWN, step, new_forager.id)
                 
     def __forager_starves(self, forager: Forager, replace: bool, step: int) -> None:
         """
@@ -466,12 +735,14 @@ class Simulation():
         """
         from_x = forager.current_coords[0]
         from_y = forager.current_coords[1]
-        self.grid[from_y][from_x] = None
-        self.foragers.remove(forager)
+        self.__set_cell(from_x, from_y, None)
+        self.__unlist_forager(forager)
         self.total_foragers_lost += 1
+        if self.metrics is not None:
+            self.metrics.count('starved')
         if replace:
             # replace with new forager
-            new_forager = Forager()
+            new_forager = Forager(config=self.forager_config)
             self.__place_object(new_forager)
                 
     def __forager_finds_ravine(self, 
@@ -489,9 +760,7 @@ class Simulation():
             """ 
             # Try to walk right. If that isn't possible, walk left.
             new_x = to_x + 1 if to_x + 1 < self.width else to_x - 1
-            self.grid[from_y][new_x] = self.grid[from_y][from_x]
-            self.grid[from_y][from_x] = None
-            forager.current_coords = (new_x, from_y)
+            self.__move_forager(forager, new_x, from_y)
             
         def vertical_step():
             """
@@ -499,32 +768,22 @@ class Simulation():
             """
             # Try to walk up. If that isn't possible, walk down.
             new_y = to_y + 1 if to_y + 1 < self.height else to_y - 1
-            self.grid[new_y][from_x] = self.grid[from_y][from_x]
-            self.grid[from_y][from_x] = None
-            forager.current_coords = (from_x, new_y)
+            self.__move_forager(forager, from_x, new_y)
             
         from_x = forager.current_coords[0]
         from_y = forager.current_coords[1]
-        ravine = self.grid[to_y][to_x]
+        ravine = self.grid.get(to_x, to_y)
 
         can_traverse = forager.traverse_ravine(ravine)
-        log_match1 = f'{forager.id} successfully crossed ravine.'
-        log_match2 = f'{forager.id} fails to cross ravine.'
         
         if abs(to_x - from_x) > abs(to_y - from_y):
             # Forager is moving horizontally    
             if can_traverse:
                 # determine if moving left-to-right or right-to-left
                 new_x_coord = to_x + ravine.width + 1 if to_x > from_x else to_x - ravine.width - 1
-                # use foragers log to see if it attempted this jump before
-                # If it did, walk up/down instead of jumping
-                if log_match1 == str(forager.log[-1]) or log_match2 == str(forager.log[-1]):
-                    vertical_step()
-                elif 0 <= new_x_coord < self.width and not isinstance(self.grid[to_y][new_x_coord], Ravine):
+                if 0 <= new_x_coord < self.width and not isinstance(self.grid.get(new_x_coord, to_y), Ravine):
                     # Make horizontal jump
-                    self.grid[to_y][new_x_coord] = self.grid[from_y][from_x]
-                    self.grid[from_y][from_x] = None
-                    forager.current_coords = (new_x_coord, to_y)
+                    self.__move_forager(forager, new_x_coord, to_y)
                 else:
                     # ravine is on simulation edge so step up/down instead
                     # Take a vertical step instead
@@ -537,15 +796,9 @@ class Simulation():
             if can_traverse:
                 # determine if moving up or down
                 new_y_coord = to_y + ravine.height + 1 if to_y > from_y else to_y - ravine.height - 1
-                if log_match1 == str(forager.log[-1]) or log_match2 == str(forager.log[-1]):
-                # use foragers log to see if it attempted this jump before
-                # If it did, walk right/left instead of jumping
-                    horizontal_step()
-                elif 0 <= new_y_coord < self.height and not isinstance(self.grid[new_y_coord][to_x], Ravine):
+                if 0 <= new_y_coord < self.height and not isinstance(self.grid.get(to_x, new_y_coord), Ravine):
                     # Make vertical jump
-                    self.grid[new_y_coord][to_x] = self.grid[from_y][from_x]
-                    self.grid[from_y][from_x] = None
-                    forager.current_coords = (to_x, new_y_coord)
+                    self.__move_forager(forager, to_x, new_y_coord)
                 else:
                     # Ravine is on simulation edge so step right/left instead
                     horizontal_step()
@@ -562,9 +815,9 @@ class Simulation():
         A compatibilty check takes place and the foragers may produce
         offspring which appears at a random location.
         """
-        potential_mate = self.grid[to_y][to_x]
+        potential_mate = self.grid.get(to_x, to_y)
         if forager.is_compatible_with(potential_mate):
-            offspring = forager.produce_offspring(potential_mate)
+            offspring = forager.produce_offspring(potential_mate, self.ids.allocate())
             self.__place_object(offspring)
             self.total_mating_attempts += 1
             self.total_offspring_produced += 1
@@ -589,77 +842,79 @@ class Simulation():
         There are no obstructions so the forager takes a step in the 
         direction it is heading.
         """
-        from_x = forager.current_coords[0]
-        from_y = forager.current_coords[1]
-        self.grid[to_y][to_x] = self.grid[from_y][from_x]
-        self.grid[from_y][from_x] = None
-        forager.current_coords = (to_x, to_y)
+        self.__move_forager(forager, to_x, to_y)
+    
+    def __list_forager(self, forager: Forager) -> None:
+        """
+        Adds a forager to the list of foragers in the simulation.
+        """
+        self.foragers.append(forager)
+        self.population.set(forager.population_row, 'listed', 
+                            self.population.get(forager.population_row, 'listed') + 1)
+    
+    def __unlist_forager(self, forager: Forager) -> None:
+        """
+        Removes a forager from the list of foragers in the simulation.
+        """
+        self.foragers.remove(forager)
+        self.population.set(forager.population_row, 'listed', 
+                            self.population.get(forager.population_row, 'listed') - 1)
     
     def __gather_gene_trend_data(self):
-        agility = 0
-        perception = 0
-        strength = 0
-        endurance = 0
-        for fo in self.foragers:
-            agility += fo.agility
-            perception += fo.perception
-            strength += fo.strength
-            endurance += fo.endurance
-        self.gene_trends['average agility'].append(
-            round(agility / len(self.foragers), ndigits=2)
-            )
-        self.gene_trends['average perception'].append(
-            round(perception / len(self.foragers), ndigits=2)
-            )
-        self.gene_trends['average strength'].append(
-            round(strength / len(self.foragers), ndigits=2)
-            )
-        self.gene_trends['average endurance'].append(
-            round(endurance / len(self.foragers), ndigits=2)
-            )
+        if self.population.num_listed() == 0:
+            raise ZeroDivisionError
+        for gene in ['agility', 'perception', 'strength', 'endurance']:
+            self.gene_trends[f'average {gene}'].append(
+                round(self.population.listed_mean(gene), ndigits=2)
+                )
 
 class GridFull(Exception):
-    def __init__(self):
-        self.message = 'Grid is full.\n'
-        super().__init__(self.message)
+    def __init__(self, message: str = 'Grid is full.\n'):
+        self.message = message
+        super().__init__(message)
         
 class MoveError(Exception):
-    def __init__(self):
-        self.message = 'Invalid forager move.\n'
-        super().__init__(self.message)
+    def __init__(self, message: str = 'Invalid forager move.\n'):
+        self.message = message
+        super().__init__(message)
 
 # region Analytics
 class SimulationAnalytics:
     """
     Processes and plots data gathered while running the simulation.
+    
+    Matplotlib and seaborn are only imported when the first chart is 
+    drawn. Charts are saved and closed; they are only shown if asked.
+    `render_all` draws charts in parallel and skips any whose data has
+    not changed since they were last saved.
     """
-    def __init__(self, simulation: Simulation) -> None:
+    def __init__(self, 
+                 simulation: Simulation, 
+                 show: bool = False,
+                 formats: tuple[str, ...] = ('png',)) -> None:
+        """
+        Args:
+            simulation (Simulation): A simulation that has been run.
+            show (bool): Show each chart in a window after saving it. 
+                Otherwise charts are drawn with the non-interactive Agg
+                backend, so no display is needed.
+            formats (tuple[str, ...]): File formats to save charts in, 
+                such as 'png', or 'svg' and 'pdf' for vector output.
+        """
         self.__grid = simulation
+        self.show = show
+        self.formats = tuple(formats)
         self.__foragers = [forager for forager in self.__grid.foragers]
         self.save_directory = f'logs/{self.__grid.run_name}/charts'
-        
-        if os.path.exists(self.save_directory):
-            shutil.rmtree(self.save_directory)
-        
-        os.makedirs(self.save_directory)
+        # Charts are kept between runs so unchanged ones can be skipped
+        os.makedirs(self.save_directory, exist_ok=True)
         
     def chart_compare_decisions(self) -> None:
         """
         Bar chart displaying the number of novel decisions compared to
         repeated decisions.
         """
-        num_novel = 0
-        num_decisions = 0
-        for forager in self.__foragers:
-            num_novel += forager.num_novel_decisions
-            num_decisions += forager.num_decisions
-        num_decisions = num_decisions - num_novel
-        plt.bar(['Novel', 'Repeated'], [num_novel, num_decisions])
-        plt.title('Types of Decisions Made')
-        plt.xlabel('Decision')
-        plt.ylabel('No. of Decisions')
-        plt.savefig(f'{self.save_directory}/compare_decisions.png')
-        plt.show()
+        self.__draw('compare_decisions')
     
     def chart_simulation_metrics(self) -> None:
         """
@@ -671,71 +926,135 @@ class SimulationAnalytics:
         - total hunters lost
         - total foragers lost after reaching their age limit
         """
-        keys = list(self.__grid.simulation_metrics.keys())
-        # key_labels = [label.split('_').title() for label in keys]
-        values = list(self.__grid.simulation_metrics.values())
-        final_values = []
-        for value in values:
-            if len(value) > 1:
-                final_values.append(value[-1][1])
-            else:
-                final_values.append(0)
-        plt.figure(figsize=(16, 6))
-        plt.bar(keys, final_values)
-        plt.title('Simulation Metrics')
-        plt.ylabel('Metric Value')
-        plt.xlabel('Metric')
-        plt.savefig(f'{self.save_directory}/simulation_metrics.png')
-        plt.show()
+        self.__draw('simulation_metrics')
         
     def chart_gene_changes(self) -> None:
         """
         Plots a chart showing the average growth in dynamic attributes.
         Measurements are taken every 10 steps.
         """
-        legend_labels = []
-        for k, v in self.__grid.gene_trends.items():
-            # attribute name is in form 'average "attribute"'
-            attribute_name = k.split()[1].title()
-            legend_labels.append(attribute_name)
-            plt.plot(range(self.__grid.num_steps), v)
-        plt.title('Average Gene Trends')
-        plt.xlabel('Step')
-        plt.ylabel('Gene Value')
-        plt.legend(legend_labels)
-        plt.savefig(f'{self.save_directory}/gene_changes.png')
-        plt.show()
+        self.__draw('gene_changes')
     
     def chart_motivations(self) -> None:
         """
         A bar chart displaying how many times each motivation was chosen.
         """
-        keys = list(self.__grid.total_motivations.keys())
-        values  = list(self.__grid.total_motivations.values())
-        plt.figure(figsize=(16, 6))
-        plt.bar(keys, values)
-        plt.title('Motivations Chosen')
-        plt.ylabel('No. of Times')
-        plt.xlabel('Motivation')
-        plt.savefig(f'{self.save_directory}/motivations.png')
-        plt.show()
+        self.__draw('motivations')
     
     def chart_lifetime_lengths(self) -> None:
         """
         A bar chart displaying the lifetime length of each forager.
         """
-        lifetimes = [(forager.id, forager.steps_alive) for forager in self.__foragers]
-        lifetimes_asc = sorted(lifetimes, key=lambda x: [1], reverse=True)
-        life_lengths = []
-        for f in lifetimes_asc:
-            life_lengths.append(f[1])
-        plt.title('Forager Lifetimes')
-        plt.xlabel('Forager Number')
-        plt.ylabel('Lifetime Length')
-        plt.bar(range(len(self.__foragers)), life_lengths)
-        plt.xticks(range(len(self.__foragers)), range(1, len(self.__foragers) + 1))
-        plt.savefig(f'{self.save_directory}/lifetime_lengths.png')
-        plt.show()
+        self.__draw('lifetime_lengths')
+    
+    def render_all(self, max_workers: int = None) -> list[str]:
+        """
+        Draws every chart, one process per chart, skipping charts whose
+        data and formats have not changed since they were last saved.
+        Charts that are shown are drawn one at a time in this process.
+
+        Args:
+            max_workers (int): Number of processes. Defaults to the number
+                of cores.
+
+        Returns:
+            list[str]: Names of the charts that were drawn.
+        """
+        manifest = self.__load_manifest()
+        pending = {}
+        for name in CHARTS:
+            data = self.__chart_data(name)
+            fingerprint = self.__fingerprint(data)
+            if not self.show and manifest.get(name) == fingerprint and self.__saved(name):
+                continue
+            pending[name] = (data, fingerprint)
+
+        if self.show or len(pending) < 2:
+            for name, (data, _) in pending.items():
+                draw_chart(name, data, self.save_directory, self.formats, self.show)
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(draw_chart, name, data, self.save_directory, self.formats)
+                           for name, (data, _) in pending.items()]
+                for future in futures:
+                    future.result()
+
+        for name, (_, fingerprint) in pending.items():
+            manifest[name] = fingerprint
+        self.__save_manifest(manifest)
+        return list(pending)
+    
+    def __draw(self, name: str) -> None:
+        """
+        Draws one chart in this process and records it in the manifest.
+        """
+        data = self.__chart_data(name)
+        draw_chart(name, data, self.save_directory, self.formats, self.show)
+        manifest = self.__load_manifest()
+        manifest[name] = self.__fingerprint(data)
+        self.__save_manifest(manifest)
+    
+    def __chart_data(self, name: str) -> dict:
+        """
+        Gathers the values plotted in a chart.
+        """
+        if name == 'compare_decisions':
+            num_novel = 0
+            num_decisions = 0
+            for forager in self.__foragers:
+                num_novel += forager.num_novel_decisions
+                num_decisions += forager.num_decisions
+            return {'num_novel': num_novel, 'num_repeated': num_decisions - num_novel}
+        if name == 'simulation_metrics':
+            keys = list(self.__grid.simulation_metrics.keys())
+            values = list(self.__grid.simulation_metrics.values())
+            final_values = []
+            for value in values:
+                if len(value) > 1:
+                    final_values.append(value[-1][1])
+                else:
+                    final_values.append(0)
+            return {'keys': keys, 'final_values': final_values}
+        if name == 'gene_changes':
+            # attribute name is in form 'average "attribute"'
+            trends = {k.split()[1].title(): list(v) for k, v in self.__grid.gene_trends.items()}
+            return {'num_steps': self.__grid.num_steps, 'trends': trends}
+        if name == 'motivations':
+            return {'keys': list(self.__grid.total_motivations.keys()),
+                    'values': list(self.__grid.total_motivations.values())}
+        if name == 'lifetime_lengths':
+            lifetimes = [(forager.id, forager.steps_alive) for forager in self.__foragers]
+            lifetimes_asc = sorted(lifetimes, key=lambda x: [1], reverse=True)
+            return {'life_lengths': [f[1] for f in lifetimes_asc]}
+        raise ValueError(f'Unknown chart: {name}. Choose from {CHARTS}.')
+    
+    def __fingerprint(self, data: dict) -> str:
+        """
+        Hash of a charts data and output formats.
+        """
+        content = json.dumps([data, self.formats], sort_keys=True)
+        return hashlib.sha256(content.encode()).hexdigest()
+    
+    def __saved(self, name: str) -> bool:
+        """
+        Checks that a chart has been saved in every format.
+        """
+        return all(os.path.exists(f'{self.save_directory}/{name}.{file_format}')
+                   for file_format in self.formats)
+    
+    def __load_manifest(self) -> dict:
+        """
+        Fingerprints of the charts last saved in the charts directory.
+        """
+        path = f'{self.save_directory}/manifest.json'
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+    
+    def __save_manifest(self, manifest: dict) -> None:
+        with open(f'{self.save_directory}/manifest.json', 'w') as f:
+            json.dump(manifest, f, indent=2)
     
     def stdout_eol_foragers(self) -> None:
         """
@@ -761,8 +1080,8 @@ class SimulationAnalytics:
         """
         Displays full motivation metrics dictionary.
         """
-        print(f'Forager {forager.id}\n')
-        for motivation, details in forager.motivation_metrics.items():
+        print(f'Forager {forager.alias}\n')
+        for motivation, details in forager.motivation_metrics.as_dict().items():
             print(f'{motivation.title()}')
             if not isinstance(details, dict):
                 print(f'{motivation.title()}: {details}')
@@ -0,0 +1,173 @@
+import csv
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields, replace
+
+from ..agents.forager_config import ForagerConfig
+from .ensemble import Scenario, run_replicate
+
+CONFIG_PARAMETERS = [field.name for field in fields(ForagerConfig)]
+SCENARIO_PARAMETERS = [field.name for field in fields(Scenario)]
+
+# region Sampling
+def grid_runs(space: dict[str, list]) -> list[dict]:
+    """
+    Every combination of parameter values.
+
+    Args:
+        space (dict[str, list]): Values to try for each parameter.
+
+    Returns:
+        list[dict]: Parameter values of each run.
+    """
+    names = list(space)
+    return [dict(zip(names, values))
+            for values in itertools.product(*(space[name] for name in names))]
+
+def random_runs(space: dict[str, list | dict], num_runs: int, seed: int = 0) -> list[dict]:
+    """
+    A random sample of parameter values.
+
+    A list is sampled by choosing one of its values. A dict with 'low'
+    and 'high' is sampled uniformly from that range, as integers if both
+    bounds are integers.
+
+    Args:
+        space (dict[str, list | dict]): Values to sample for each parameter.
+        num_runs (int): Number of runs.
+        seed (int): Seed for the sample. Does not affect the simulations.
+
+    Returns:
+        list[dict]: Parameter values of each run.
+    """
+    rng = random.Random(seed)
+
+    def sample(values):
+        if isinstance(values, dict):
+            low, high = values['low'], values['high']
+            if isinstance(low, int) and isinstance(high, int):
+                return rng.randint(low, high)
+            return rng.uniform(low, high)
+        return rng.choice(values)
+
+    return [{name: sample(values) for name, values in space.items()}
+            for _ in range(num_runs)]
+
+# region Sweep
+def apply_parameters(parameters: dict,
+                     scenario: Scenario,
+                     config: ForagerConfig) -> tuple[Scenario, ForagerConfig]:
+    """
+    Copies a scenario and forager config with some values replaced.
+    Neither the originals nor `forager_config.toml` are changed.
+
+    Raises:
+        ValueError: A parameter is not a scenario or forager config value,
+            or is out of range.
+    """
+    scenario_values = {}
+    config_values = {}
+    for name, value in parameters.items():
+        if name in SCENARIO_PARAMETERS:
+            scenario_values[name] = value
+        elif name in CONFIG_PARAMETERS:
+            config_values[name] = value
+        else:
+            raise ValueError(f'Unknown sweep parameter: {name}. '
+                             f'Choose from {SCENARIO_PARAMETERS + CONFIG_PARAMETERS}.')
+    return replace(scenario, **scenario_values), replace(config, **config_values)
+
+def run_sweep(runs: list[dict],
+              run_name: str,
+              scenario: Scenario = Scenario(),
+              forager_config: ForagerConfig = None,
+              replicates: int = 1,
+              base_seed: int = 0,
+              max_workers: int = None,
+              log_level: str = 'summary',
+              record_grid_history: bool = False) -> list[dict]:
+    """
+    Runs a simulation for every set of parameters in parallel, one
+    process per core, and saves one row per simulation to
+    `logs/<run_name>/results.csv`.
+
+    Simulation i is seeded with `base_seed + i` and writes its output to
+    `logs/<run_name>/run_<i>`. Only the final metrics are needed, so by
+    default each simulation records just a summary event log and no
+    replay file or forager logs. A simulation that fails is recorded with
+    status 'failed' and its error, and does not stop the others; the
+    table is written either way.
+
+    Args:
+        runs (list[dict]): Parameter values of each run, from
+            `grid_runs()` or `random_runs()`.
+        run_name (str): Name of directory to store information.
+        scenario (Scenario): Values of scenario parameters not in a run.
+        forager_config (ForagerConfig): Values of forager parameters not
+            in a run. Loaded from `forager_config.toml` if not given.
+        replicates (int): Number of simulations of each run.
+        base_seed (int): Seed of the first simulation.
+        max_workers (int): Number of processes. Defaults to the number
+            of cores.
+        log_level (str): How much each simulation records in its event
+            log. See `LogLevel`.
+        record_grid_history (bool): Write a replay file for each
+            simulation.
+
+    Returns:
+        list[dict]: The rows of the results table.
+    """
+    if forager_config is None:
+        forager_config = ForagerConfig.from_toml()
+    # Fail before starting any simulation if a run is invalid
+    jobs = []
+    for parameters in runs:
+        run_scenario, run_config = apply_parameters(parameters, scenario, forager_config)
+        for _ in range(replicates):
+            jobs.append((parameters, run_scenario, run_config))
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(run_replicate, run_scenario, base_seed + i,
+                                   f'{run_name}/run_{i}', run_config, False,
+                                   log_level, record_grid_history)
+                   for i, (_, run_scenario, run_config) in enumerate(jobs)]
+        rows = []
+        for i, ((parameters, _, _), future) in enumerate(zip(jobs, futures)):
+            try:
+                summary = future.result()
+            except Exception as e:
+                summary = {'seed': base_seed + i, 'status': 'failed',
+                           'error': f'{type(e).__name__}: {e}'}
+            rows.append(tidy_row(i, parameters, summary))
+
+    # Failed runs have no metrics, so columns are gathered from every row
+    fieldnames = list(dict.fromkeys(name for row in rows for name in row))
+    os.makedirs(f'logs/{run_name}', exist_ok=True)
+    with open(f'logs/{run_name}/results.csv', 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    return rows
+
+def tidy_row(run: int, parameters: dict, summary: dict) -> dict:
+    """
+    Flattens the summary of a simulation into one row of the results
+    table, alongside its parameters. A simulation whose process failed
+    has only its status and error.
+    """
+    row = {'run': run, 'seed': summary['seed']}
+    row.update(parameters)
+    row['status'] = summary['status']
+    row['error'] = summary['error']
+    if 'simulation_metrics' not in summary:
+        return row
+    row['steps_run'] = summary['steps_run']
+    row.update(summary['simulation_metrics'])
+    for gene, values in summary['gene_trends'].items():
+        # Final average, or empty if no steps were taken
+        row[gene.replace(' ', '_')] = values[-1] if values else None
+    for motivation, times in summary['total_motivations'].items():
+        row[f"times_{motivation.replace(' ', '_')}"] = times
+    return row
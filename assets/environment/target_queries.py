@@ -0,0 +1,101 @@
+import numpy as np
+
+# Number of foragers compared against all targets at once.
+# Bounds the size of the distance matrix for large populations.
+CHUNK_SIZE = 1024
+
+def nearest_and_furthest(sources: np.ndarray,
+                         targets: np.ndarray,
+                         exclude: np.ndarray = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Finds the nearest and furthest target from every source by Manhattan
+    distance. Ties go to the target that comes first.
+
+    Args:
+        sources (np.ndarray): (N, 2) array of (x,y) coordinates.
+        targets (np.ndarray): (M, 2) array of (x,y) coordinates.
+        exclude (np.ndarray): (N,) array holding, for each source, the
+            index of a target to ignore (such as itself) or -1.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Index of the nearest and furthest
+            target for each source, or -1 where there is no target.
+    """
+    sources = np.asarray(sources, dtype=np.int32).reshape(-1, 2)
+    targets = np.asarray(targets, dtype=np.int32).reshape(-1, 2)
+    num_sources = len(sources)
+    nearest = np.full(num_sources, -1, dtype=np.int64)
+    furthest = np.full(num_sources, -1, dtype=np.int64)
+    if num_sources == 0 or len(targets) == 0:
+        return nearest, furthest
+
+    for start in range(0, num_sources, CHUNK_SIZE):
+        chunk = slice(start, start + CHUNK_SIZE)
+        # (chunk, M) matrix of distances from each source to each target
+        distances = (np.abs(sources[chunk, 0, None] - targets[None, :, 0]) +
+                     np.abs(sources[chunk, 1, None] - targets[None, :, 1]))
+        valid = np.ones(distances.shape, dtype=bool)
+        if exclude is not None:
+            rows = np.arange(distances.shape[0])
+            excluded = np.asarray(exclude[chunk])
+            has_exclusion = excluded >= 0
+            valid[rows[has_exclusion], excluded[has_exclusion]] = False
+        # Masked targets can never be nearest or furthest
+        big = np.iinfo(np.int32).max
+        nearest[chunk] = np.where(valid, distances, big).argmin(axis=1)
+        furthest[chunk] = np.where(valid, distances, -1).argmax(axis=1)
+        no_targets = ~valid.any(axis=1)
+        nearest[chunk][no_targets] = -1
+        furthest[chunk][no_targets] = -1
+    return nearest, furthest
+
+class StepTargets():
+    """
+    The nearest and furthest food and forager for every forager, resolved
+    together at the start of a simulation step.
+    """
+    def __init__(self, located_foragers: list, located_foods: list) -> None:
+        """
+        Args:
+            located_foragers (list): (forager, (x,y)) pairs.
+            located_foods (list): (food, (x,y)) pairs.
+        """
+        self.__rows = {forager: i for i, (forager, _) in enumerate(located_foragers)}
+        # Where each forager was when its targets were resolved
+        self.__forager_locations = [location for _, location in located_foragers]
+        self.__food_locations = [location for _, location in located_foods]
+
+        forager_xy = np.array(self.__forager_locations, dtype=np.int32).reshape(-1, 2)
+        food_xy = np.array(self.__food_locations, dtype=np.int32).reshape(-1, 2)
+        self.__nearest_food, self.__furthest_food = nearest_and_furthest(forager_xy, food_xy)
+        # Foragers ignore themselves
+        self.__nearest_forager, self.__furthest_forager = nearest_and_furthest(
+            forager_xy, forager_xy, exclude=np.arange(len(forager_xy))
+        )
+
+    def destination(self, forager, motivation: str) -> tuple[int, int] | None:
+        """
+        Gets the destination of a distance based motivation.
+
+        Returns:
+            tuple[int, int] | None: (x,y) coordinates, or None if the
+                forager was not in the simulation at the start of the step,
+                has moved since, or has no target.
+        """
+        row = self.__rows.get(forager)
+        if row is None:
+            return None
+        if forager.current_coords != self.__forager_locations[row]:
+            # Moved earlier in the step, e.g. fled a hunter
+            return None
+        if motivation == 'nearest food':
+            target, locations = self.__nearest_food[row], self.__food_locations
+        elif motivation == 'furthest food':
+            target, locations = self.__furthest_food[row], self.__food_locations
+        elif motivation == 'nearest forager':
+            target, locations = self.__nearest_forager[row], self.__forager_locations
+        elif motivation == 'furthest forager':
+            target, locations = self.__furthest_forager[row], self.__forager_locations
+        else:
+            return None
+        return None if target < 0 else locations[target]
@@ -0,0 +1,22 @@
+import sys
+
+from assets.environment.benchmark import World, run_suite
+
+# Times the simulation hot paths in seeded synthetic worlds.
+# python benchmark.py [output file] [sizes] [densities] [repeats]
+# e.g. python benchmark.py logs/benchmark/results.json 15,50,150 0.02,0.1 5
+
+if __name__ == '__main__':
+    output_path = sys.argv[1] if len(sys.argv) > 1 else 'logs/benchmark/results.json'
+    sizes = [int(size) for size in sys.argv[2].split(',')] if len(sys.argv) > 2 else [15, 50, 150]
+    densities = ([float(density) for density in sys.argv[3].split(',')]
+                 if len(sys.argv) > 3 else [0.05])
+    repeats = int(sys.argv[4]) if len(sys.argv) > 4 else 5
+
+    worlds = [World(size=size, density=density) for size in sizes for density in densities]
+    suite = run_suite(worlds, repeats=repeats, output_path=output_path)
+    for result in suite['results']:
+        world = result['world']
+        print(f"{result['benchmark']:<24} {world['size']:>4}x{world['size']:<4} "
+              f"density {world['density']:<5} {result['best'] * 1e6:>12.2f} us/call")
+    print(f'Results saved to {output_path}')
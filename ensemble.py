@@ -0,0 +1,34 @@
+import sys
+
+from assets.environment.ensemble import Scenario, run_ensemble
+
+# Runs replicates of one scenario in parallel.
+# python ensemble.py <replicates> <foragers> <hunters> <ravines> <food>
+#                    <grid height> <grid width> <steps> <run name> [base seed]
+
+if __name__ == '__main__':
+    if len(sys.argv) < 10:
+        num_replicates = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+        scenario = Scenario()
+        run_name = 'ensemble'
+        base_seed = 0
+    else:
+        num_replicates = int(sys.argv[1])
+        scenario = Scenario(
+            num_foragers=int(sys.argv[2]),
+            num_hunters=int(sys.argv[3]),
+            num_ravines=int(sys.argv[4]),
+            num_food=int(sys.argv[5]),
+            grid_height=int(sys.argv[6]),
+            grid_width=int(sys.argv[7]),
+            steps=int(sys.argv[8]),
+        )
+        run_name = str(sys.argv[9])
+        base_seed = int(sys.argv[10]) if len(sys.argv) > 10 else 0
+
+    results = run_ensemble(scenario, num_replicates, run_name, base_seed=base_seed)
+    for result in results:
+        if result['status'] == 'ok':
+            print(f"{result['run_name']} (seed {result['seed']}): {result['simulation_metrics']}")
+        else:
+            print(f"{result['run_name']} (seed {result['seed']}) failed: {result['error']}")
@@ -6,16 +6,17 @@ from assets.agents.food import Food
 from assets.agents.ravine import Ravine
 from assets.environment.simulation import Simulation
 from assets.environment.simulation import SimulationAnalytics
+from assets.environment.event_log import render_text
 
-def load_default_inhabitants():
+def load_default_inhabitants(config):
     return [
     Ravine(grid_width=DEFAULT_GRID_WIDTH),
     Ravine(grid_width=DEFAULT_GRID_WIDTH),
     Ravine(grid_width=DEFAULT_GRID_WIDTH),
-    Forager(sex='M'),
-    Forager(sex='M'),
-    Forager(sex='F'),
-    Forager(sex='F'),
+    Forager(sex='M', config=config),
+    Forager(sex='M', config=config),
+    Forager(sex='F', config=config),
+    Forager(sex='F', config=config),
     Hunter(),
     Hunter(),
     Hunter(),
@@ -35,7 +36,7 @@ if len(sys.argv) < 8:
     # load default simulation config
     run_name = 'run_name'
     simulation = Simulation(DEFAULT_GRID_WIDTH, DEFAULT_GRID_HEIGHT, run_name)
-    environment = load_default_inhabitants()
+    environment = load_default_inhabitants(simulation.forager_config)
     simulation_steps = DEFAULT_SIMULATION_STEPS
 else:
     # read command line arguments
@@ -54,9 +55,9 @@ else:
         environment.append(Ravine(grid_width=DEFAULT_GRID_WIDTH))
     for i in range(num_foragers):
         if i % 2 == 0:
-            environment.append(Forager(sex='M'))
+            environment.append(Forager(sex='M', config=simulation.forager_config))
         else:
-            environment.append(Forager(sex='F'))
+            environment.append(Forager(sex='F', config=simulation.forager_config))
     for i in range(num_hunters):
         environment.append(Hunter())
     for i in range(num_food):
@@ -64,10 +65,13 @@ else:
 
 simulation.setup_environment(environment)
 simulation.run(steps=simulation_steps, replace=False, display=True)
+# human-readable log of the simulation
+render_text(f'logs/{run_name}/simulation/events.jsonl', 
+            f'logs/{run_name}/simulation/log.txt')
 
 simulation.save_forager_logs(run_name=run_name)
 
-analytics = SimulationAnalytics(simulation=simulation)
+analytics = SimulationAnalytics(simulation=simulation, show=True)
 analytics.chart_compare_decisions()
 analytics.chart_simulation_metrics()
 analytics.chart_gene_changes()
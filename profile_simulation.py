@@ -0,0 +1,42 @@
+import random
+import sys
+
+from assets.environment.ensemble import Scenario
+from assets.environment.profiling import profile_run
+from assets.environment.simulation import Simulation
+
+# Profiles a simulation and writes the results to logs/<run name>/profile.
+# python profile_simulation.py <deterministic | sampling> [<foragers> <hunters>
+#                              <ravines> <food> <grid height> <grid width>
+#                              <steps> <run name> [seed]]
+
+if __name__ == '__main__':
+    mode = sys.argv[1] if len(sys.argv) > 1 else 'deterministic'
+    if len(sys.argv) < 10:
+        scenario = Scenario()
+        run_name = 'profile'
+        seed = 0
+    else:
+        scenario = Scenario(
+            num_foragers=int(sys.argv[2]),
+            num_hunters=int(sys.argv[3]),
+            num_ravines=int(sys.argv[4]),
+            num_food=int(sys.argv[5]),
+            grid_height=int(sys.argv[6]),
+            grid_width=int(sys.argv[7]),
+            steps=int(sys.argv[8]),
+        )
+        run_name = str(sys.argv[9])
+        seed = int(sys.argv[10]) if len(sys.argv) > 10 else 0
+
+    random.seed(seed)
+    simulation = Simulation(scenario.grid_width, scenario.grid_height, run_name)
+    simulation.setup_environment(scenario.build_environment(simulation.forager_config))
+    attribution = profile_run(simulation, scenario.steps, scenario.replace, display=True, mode=mode)
+
+    total = sum(attribution['phases'].values())
+    for group in ('phases', 'agent_types'):
+        print(group.replace('_', ' ').title())
+        for name, value in sorted(attribution[group].items(), key=lambda item: -item[1]):
+            print(f'  {name:<14} {value / total:>7.1%}')
+    print(f'Profile saved to logs/{run_name}/profile')
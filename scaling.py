@@ -0,0 +1,37 @@
+import sys
+
+from assets.environment.scaling import (BASELINE_PATH, compare_to_baseline, format_report,
+                                        load_baseline, run_scaling, save_baseline,
+                                        scaling_cases)
+
+# Measures how throughput and memory scale with grid size and population,
+# and fails if throughput has dropped below the committed baseline, scaled
+# to the speed of this machine on a reference workload.
+# python scaling.py [threshold] [--save-baseline] [--quick]
+#   threshold        largest acceptable drop in steps per second (default 0.25)
+#   --save-baseline  replace the baseline with this run
+#   --quick          grid sizes up to 150 only
+
+if __name__ == '__main__':
+    flags = [arg for arg in sys.argv[1:] if arg.startswith('--')]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    threshold = float(args[0]) if args else 0.25
+
+    grid_sizes = [15, 50, 150] if '--quick' in flags else [15, 50, 150, 500]
+    cases = scaling_cases(grid_sizes=grid_sizes)
+    output = run_scaling(cases)
+    for curve in output['curves']:
+        exponents = ', '.join(f'{exponent:.2f}' for exponent in curve['exponents'])
+        print(f"{curve['curve']:<44} exponents {exponents}")
+    print('Results saved to logs/scaling')
+
+    if '--save-baseline' in flags:
+        save_baseline(output['results'],
+                      {'seed': 0, 'repeats': 3, 'steps': cases[0].steps,
+                       'grid_sizes': grid_sizes})
+        print(f'Baseline saved to {BASELINE_PATH}')
+    else:
+        rows = compare_to_baseline(output['results'], load_baseline(), threshold)
+        print(format_report(rows, threshold))
+        if any(row['regressed'] for row in rows):
+            sys.exit(1)
@@ -0,0 +1,24 @@
+import sys
+import tomllib
+
+from assets.environment.sweep import grid_runs, random_runs, run_sweep
+
+# Runs a parameter sweep described by a toml file.
+# python sweep.py <sweep file>
+
+if __name__ == '__main__':
+    with open(sys.argv[1], 'rb') as f:
+        spec = tomllib.load(f)
+
+    if spec.get('mode', 'grid') == 'grid':
+        runs = grid_runs(spec['parameters'])
+    else:
+        runs = random_runs(spec['parameters'],
+                           num_runs=spec['num_runs'],
+                           seed=spec.get('sample_seed', 0))
+
+    rows = run_sweep(runs,
+                     run_name=spec.get('run_name', 'sweep'),
+                     replicates=spec.get('replicates', 1),
+                     base_seed=spec.get('base_seed', 0))
+    print(f"{len(rows)} simulations saved to logs/{spec.get('run_name', 'sweep')}/results.csv")